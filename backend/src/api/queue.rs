@@ -2,10 +2,20 @@ pub mod queue {
     tonic::include_proto!("queue");
 }
 
+use std::sync::LazyLock;
+
 use queue::queue_server::Queue;
-use queue::{Entity, GetQueueRequest, GetQueueResponse, SetQueueRequest, SetQueueResponse};
-use redis::AsyncCommands;
+use queue::{
+    AddEntityRequest, AddEntityResponse, Entity, GetPositionRequest, GetPositionResponse,
+    GetQueueRequest, GetQueueResponse, ListQueuesForEntityRequest, ListQueuesForEntityResponse,
+    RemoveEntitiesWhereRequest, RemoveEntitiesWhereResponse, RemoveEntityRequest,
+    RemoveEntityResponse, SetQueueRequest, SetQueueResponse, StreamQueueRequest,
+    StreamQueueResponse,
+};
 use redis::aio::MultiplexedConnection;
+use redis::{AsyncCommands, Script};
+use tokio::sync::mpsc;
+use tokio_stream::wrappers::ReceiverStream;
 use tonic::{Request, Response, Status};
 use tracing::Instrument;
 use tracing::{debug, info_span};
@@ -22,10 +32,258 @@ fn queue_key(queue: String) -> String {
     format!("queue:{queue}")
 }
 
+fn version_key(queue: String) -> String {
+    format!("queue:{queue}:version")
+}
+
+// Set of queues containing an entity. Spaces in entity IDs are ignored. Must be kept in
+// step with ENTITY_QUEUES_KEY below.
+fn entity_queues_key(entity: &str) -> String {
+    format!("entity:{}:queues", entity.replace(' ', ""))
+}
+
+// Lua equivalent of entity_queues_key, prepended to each script that maintains the
+// entity to queue index. Keys for the index are derived inside the scripts as the
+// entity IDs are only known there, which assumes a single (non-clustered) Redis.
+const ENTITY_QUEUES_KEY: &str = r#"
+local function entity_queues_key(id)
+    return 'entity:' .. (string.gsub(id, ' ', '')) .. ':queues'
+end
+
+local function decode_id(item)
+    local ok, entity = pcall(cjson.decode, item)
+    if ok and type(entity.id) == 'string' then
+        return entity.id
+    end
+end
+"#;
+
+// Entities per message when a StreamQueue request does not specify a batch size.
+const DEFAULT_STREAM_BATCH_SIZE: isize = 500;
+
+// Batches buffered ahead of a slow StreamQueue client.
+const STREAM_BUFFER: usize = 4;
+
+// Number of times an unconditional SetQueue re-validates and retries when the queue
+// changes underneath it before giving up.
+const SET_QUEUE_ATTEMPTS: usize = 3;
+
+// Every script below takes the queue as KEYS[1] and its version counter as KEYS[2].
+// Each mutation increments the version so that readers can detect change, and keeps
+// the entity to queue index up to date.
+
+// Replaces queue ARGV[1] with ARGV[3..] if its version is still ARGV[2]. Returns the
+// new version, or -1 if the queue was modified concurrently.
+static SET_QUEUE: LazyLock<Script> = LazyLock::new(|| {
+    Script::new(&format!(
+        r#"
+        {ENTITY_QUEUES_KEY}
+        local version = tonumber(redis.call('GET', KEYS[2]) or '0')
+        if tonumber(ARGV[2]) ~= version then
+            return -1
+        end
+
+        local previous = {{}}
+        for _, item in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+            local id = decode_id(item)
+            if id then
+                previous[entity_queues_key(id)] = true
+            end
+        end
+
+        redis.call('DEL', KEYS[1])
+        for i = 3, #ARGV, 1000 do
+            redis.call('RPUSH', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+        end
+
+        for i = 3, #ARGV do
+            local id = decode_id(ARGV[i])
+            if id then
+                redis.call('SADD', entity_queues_key(id), ARGV[1])
+                previous[entity_queues_key(id)] = nil
+            end
+        end
+        for key in pairs(previous) do
+            redis.call('SREM', key, ARGV[1])
+        end
+
+        return redis.call('INCR', KEYS[2])
+        "#
+    ))
+});
+
+// Adds queue ARGV[1] to the index for every entity it contains. Used to build the index
+// for queues written before it existed.
+static INDEX_QUEUE: LazyLock<Script> = LazyLock::new(|| {
+    Script::new(&format!(
+        r#"
+        {ENTITY_QUEUES_KEY}
+        for _, item in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+            local id = decode_id(item)
+            if id then
+                redis.call('SADD', entity_queues_key(id), ARGV[1])
+            end
+        end
+        return 0
+        "#
+    ))
+});
+
+// Finds the entity with ID ARGV[1]. Returns its zero-based position (or -1 if it is
+// not queued), the queue length, the version and the entity itself.
+static GET_POSITION: LazyLock<Script> = LazyLock::new(|| {
+    Script::new(
+        r#"
+        local items = redis.call('LRANGE', KEYS[1], 0, -1)
+        local version = tonumber(redis.call('GET', KEYS[2]) or '0')
+        for index, item in ipairs(items) do
+            local ok, entity = pcall(cjson.decode, item)
+            if ok and entity.id == ARGV[1] then
+                return {index - 1, #items, version, item}
+            end
+        end
+        return {-1, #items, version, false}
+        "#,
+    )
+});
+
+// Appends ARGV[2] to queue ARGV[3] unless an entity with ID ARGV[1] is already queued.
+// Returns the zero-based position of the new entity (or -1 if it already exists) and
+// the version.
+static ADD_ENTITY: LazyLock<Script> = LazyLock::new(|| {
+    Script::new(&format!(
+        r#"
+        {ENTITY_QUEUES_KEY}
+        for _, item in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+            if decode_id(item) == ARGV[1] then
+                return {{-1, tonumber(redis.call('GET', KEYS[2]) or '0')}}
+            end
+        end
+        local position = redis.call('RPUSH', KEYS[1], ARGV[2]) - 1
+        redis.call('SADD', entity_queues_key(ARGV[1]), ARGV[3])
+        return {{position, redis.call('INCR', KEYS[2])}}
+        "#
+    ))
+});
+
+// Removes every entity in queue ARGV[3] whose ID matches ARGV[1]. Spaces are ignored in
+// the comparison when ARGV[2] is "1". Returns the number of entities removed and the
+// version.
+static REMOVE_ENTITIES: LazyLock<Script> = LazyLock::new(|| {
+    Script::new(&format!(
+        r#"
+        {ENTITY_QUEUES_KEY}
+        local function normalise(id)
+            if ARGV[2] == '1' then
+                return (string.gsub(id, ' ', ''))
+            end
+            return id
+        end
+
+        local target = normalise(ARGV[1])
+        local index_key = entity_queues_key(ARGV[1])
+        local removed = 0
+        local indexed = false
+        for _, item in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+            local id = decode_id(item)
+            if id and normalise(id) == target then
+                removed = removed + redis.call('LREM', KEYS[1], 1, item)
+            elseif id and entity_queues_key(id) == index_key then
+                indexed = true
+            end
+        end
+        if removed == 0 then
+            return {{0, tonumber(redis.call('GET', KEYS[2]) or '0')}}
+        end
+
+        -- Entities whose IDs only differ by spaces share an index entry
+        if not indexed then
+            redis.call('SREM', index_key, ARGV[3])
+        end
+        return {{removed, redis.call('INCR', KEYS[2])}}
+        "#
+    ))
+});
+
 impl QueueService {
     pub fn new(redis: MultiplexedConnection) -> Self {
         Self { redis }
     }
+
+    // Adds every existing queue to the entity to queue index. The index is otherwise
+    // maintained as queues change, so this only needs to run at startup to pick up
+    // queues written before the index existed.
+    pub async fn index_entities(&self) -> Result<(), redis::RedisError> {
+        let mut conn = self.redis.clone();
+        let mut cursor: u64 = 0;
+
+        loop {
+            let (next, keys): (u64, Vec<String>) = redis::cmd("SCAN")
+                .arg(cursor)
+                .arg("MATCH")
+                .arg(queue_key("*".to_string()))
+                .arg("TYPE")
+                .arg("list")
+                .query_async(&mut conn)
+                .await?;
+
+            for key in keys {
+                let Some(queue) = key.strip_prefix("queue:") else {
+                    continue;
+                };
+
+                let _: i64 = INDEX_QUEUE
+                    .key(&key)
+                    .arg(queue)
+                    .invoke_async(&mut conn)
+                    .await?;
+            }
+
+            if next == 0 {
+                return Ok(());
+            }
+            cursor = next;
+        }
+    }
+
+    // Reads the queue and its version in a single transaction.
+    async fn read_queue(
+        &self,
+        key: &str,
+        version_key: &str,
+    ) -> Result<(Vec<Entity>, u64), Status> {
+        let (entities, version, _) = self.read_range(key, version_key, 0, -1).await?;
+        Ok((entities, version))
+    }
+
+    // Reads the entities between start and stop (inclusive, as per LRANGE), the queue
+    // version and the queue length in a single transaction.
+    async fn read_range(
+        &self,
+        key: &str,
+        version_key: &str,
+        start: isize,
+        stop: isize,
+    ) -> Result<(Vec<Entity>, u64, i64), Status> {
+        let mut conn = self.redis.clone();
+
+        let (items, len, version): (Vec<String>, i64, Option<u64>) = redis::pipe()
+            .atomic()
+            .lrange(key, start, stop)
+            .llen(key)
+            .get(version_key)
+            .query_async(&mut conn)
+            .instrument(info_span!("redis", cmd = "LRANGE", key = %key, start, stop))
+            .await
+            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
+
+        let entities: Vec<Entity> = items
+            .into_iter()
+            .filter_map(|item| serde_json::from_str(&item).ok())
+            .collect();
+
+        Ok((entities, version.unwrap_or(0), len))
+    }
 }
 
 #[tonic::async_trait]
@@ -41,22 +299,183 @@ impl Queue for QueueService {
             return Err(Status::unauthenticated("user not authenticated"));
         }
 
-        let key = queue_key(request.into_inner().id);
+        let inner = request.into_inner();
+
+        let offset: isize = if inner.page_token.is_empty() {
+            inner.offset as isize
+        } else {
+            inner
+                .page_token
+                .parse::<isize>()
+                .map_err(|_| Status::invalid_argument("invalid page token"))?
+        };
+
+        if offset < 0 {
+            return Err(Status::invalid_argument("offset cannot be negative"));
+        }
+
+        if inner.page_size < 0 {
+            return Err(Status::invalid_argument("page size cannot be negative"));
+        }
+
+        let stop = if inner.page_size > 0 {
+            offset + inner.page_size as isize - 1
+        } else {
+            -1
+        };
+
+        let (entities, version, total_size) = self
+            .read_range(
+                &queue_key(inner.id.clone()),
+                &version_key(inner.id),
+                offset,
+                stop,
+            )
+            .await?;
+
+        let next_page_token = if stop >= 0 && (stop as i64) + 1 < total_size {
+            (stop + 1).to_string()
+        } else {
+            String::new()
+        };
+
+        Ok(Response::new(GetQueueResponse {
+            entities,
+            version,
+            next_page_token,
+            total_size,
+        }))
+    }
+
+    type StreamQueueStream = ReceiverStream<Result<StreamQueueResponse, Status>>;
+
+    async fn stream_queue(
+        &self,
+        request: Request<StreamQueueRequest>,
+    ) -> Result<Response<Self::StreamQueueStream>, Status> {
+        debug!("received stream_queue request: {:?}", request);
+
+        let user = user_from_request(&request);
+        if user.is_none() || user.unwrap().email.is_empty() {
+            return Err(Status::unauthenticated("user not authenticated"));
+        }
+
+        let inner = request.into_inner();
+        let batch_size = if inner.batch_size > 0 {
+            inner.batch_size as isize
+        } else {
+            DEFAULT_STREAM_BATCH_SIZE
+        };
 
-        let mut conn = self.redis.clone();
+        let key = queue_key(inner.id.clone());
+        let version_key = version_key(inner.id);
+        let (tx, rx) = mpsc::channel(STREAM_BUFFER);
+        let service = self.clone();
+
+        // Batches are read on demand so that only STREAM_BUFFER of them are held in
+        // memory. Each batch carries the version it was read at so that clients can
+        // detect the queue changing mid-stream.
+        tokio::spawn(
+            async move {
+                let mut offset: isize = 0;
+                loop {
+                    let stop = offset + batch_size - 1;
+                    let batch = service.read_range(&key, &version_key, offset, stop).await;
+
+                    let (entities, version, total_size) = match batch {
+                        Ok(batch) => batch,
+                        Err(status) => {
+                            let _ = tx.send(Err(status)).await;
+                            break;
+                        }
+                    };
 
-        let res: Vec<String> = conn
-            .lrange(&key, 0, -1)
-            .instrument(info_span!("redis", cmd = "LRANGE", key = %key))
+                    let response = StreamQueueResponse {
+                        entities,
+                        offset: offset as i64,
+                        version,
+                    };
+
+                    // The client has gone away
+                    if tx.send(Ok(response)).await.is_err() {
+                        break;
+                    }
+
+                    if (stop as i64) + 1 >= total_size {
+                        break;
+                    }
+                    offset = stop + 1;
+                }
+            }
+            .instrument(tracing::Span::current()),
+        );
+
+        Ok(Response::new(ReceiverStream::new(rx)))
+    }
+
+    async fn get_position(
+        &self,
+        request: Request<GetPositionRequest>,
+    ) -> Result<Response<GetPositionResponse>, Status> {
+        debug!("received get_position request: {:?}", request);
+
+        let user = user_from_request(&request);
+        if user.is_none() || user.unwrap().email.is_empty() {
+            return Err(Status::unauthenticated("user not authenticated"));
+        }
+
+        let inner = request.into_inner();
+        let key = queue_key(inner.id.clone());
+        let version_key = version_key(inner.id);
+
+        let mut conn = self.redis.clone();
+        let (position, length, version, item): (i64, i64, u64, Option<String>) = GET_POSITION
+            .key(&key)
+            .key(&version_key)
+            .arg(&inner.entity_id)
+            .invoke_async(&mut conn)
+            .instrument(info_span!("redis", cmd = "EVALSHA", key = %key))
             .await
             .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
 
-        let entities: Vec<Entity> = res
-            .into_iter()
-            .filter_map(|item| serde_json::from_str(&item).ok())
-            .collect();
+        Ok(Response::new(GetPositionResponse {
+            entity: item.and_then(|item| serde_json::from_str(&item).ok()),
+            position,
+            length,
+            version,
+        }))
+    }
+
+    async fn list_queues_for_entity(
+        &self,
+        request: Request<ListQueuesForEntityRequest>,
+    ) -> Result<Response<ListQueuesForEntityResponse>, Status> {
+        debug!("received list_queues_for_entity request: {:?}", request);
 
-        Ok(Response::new(GetQueueResponse { entities }))
+        let user = user_from_request(&request)
+            .ok_or_else(|| Status::unauthenticated("user not authenticated"))?;
+
+        if user.email.is_empty() {
+            return Err(Status::unauthenticated("user email is required"));
+        }
+
+        let inner = request.into_inner();
+        if inner.entity_id.replace(' ', "") != user.email.replace(' ', "") {
+            return Err(Status::permission_denied(
+                "users can only list queues for their own entities",
+            ));
+        }
+
+        let key = entity_queues_key(&inner.entity_id);
+        let mut conn = self.redis.clone();
+        let mut queue_ids: Vec<String> = conn
+            .smembers(&key)
+            .instrument(info_span!("redis", cmd = "SMEMBERS", key = %key))
+            .await
+            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
+
+        queue_ids.sort();
+        Ok(Response::new(ListQueuesForEntityResponse { queue_ids }))
     }
 
     async fn set_queue(
@@ -87,71 +506,212 @@ impl Queue for QueueService {
             ));
         }
 
-        // Get current queue state to validate changes
         let key = queue_key(inner.id.clone());
-        let mut conn = self.redis.clone();
-
-        let existing: Vec<String> = conn
-            .lrange(&key, 0, -1)
-            .instrument(info_span!("redis", cmd = "LRANGE", key = %key))
-            .await
-            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
+        let version_key = version_key(inner.id.clone());
 
-        let existing_entities: Vec<Entity> = existing
-            .into_iter()
-            .filter_map(|item| serde_json::from_str(&item).ok())
+        let items: Vec<String> = inner
+            .entities
+            .iter()
+            .filter_map(|entity| serde_json::to_string(entity).ok())
             .collect();
 
-        for entity in &inner.entities {
-            if entity.id != user.email {
-                let entity_existed = existing_entities
-                    .iter()
-                    .any(|e| e.id == entity.id && e.name == entity.name);
+        for _ in 0..SET_QUEUE_ATTEMPTS {
+            // Get current queue state to validate changes
+            let (existing_entities, current_version) =
+                self.read_queue(&key, &version_key).await?;
 
-                if !entity_existed {
-                    return Err(Status::permission_denied(format!(
-                        "users can only add or modify entities with their email as the ID ({})",
-                        user.email
+            if let Some(expected) = inner.expected_version {
+                if expected != current_version {
+                    return Err(Status::aborted(format!(
+                        "queue version is {current_version}, expected {expected}"
                     )));
                 }
             }
-        }
 
-        for existing_entity in &existing_entities {
-            if existing_entity.id != user.email {
-                let still_exists = inner.entities.iter().any(|e| e.id == existing_entity.id);
+            for entity in &inner.entities {
+                if entity.id != user.email {
+                    let entity_existed = existing_entities
+                        .iter()
+                        .any(|e| e.id == entity.id && e.name == entity.name);
 
-                if !still_exists {
-                    return Err(Status::permission_denied(
-                        "users cannot remove entities that don't belong to them",
-                    ));
+                    if !entity_existed {
+                        return Err(Status::permission_denied(format!(
+                            "users can only add or modify entities with their email as the ID ({})",
+                            user.email
+                        )));
+                    }
                 }
             }
+
+            for existing_entity in &existing_entities {
+                if existing_entity.id != user.email {
+                    let still_exists = inner.entities.iter().any(|e| e.id == existing_entity.id);
+
+                    if !still_exists {
+                        return Err(Status::permission_denied(
+                            "users cannot remove entities that don't belong to them",
+                        ));
+                    }
+                }
+            }
+
+            let mut conn = self.redis.clone();
+            let span = info_span!("redis", cmd = "EVALSHA", key = %key, count = items.len());
+            let version: i64 = SET_QUEUE
+                .key(&key)
+                .key(&version_key)
+                .arg(&inner.id)
+                .arg(current_version)
+                .arg(&items)
+                .invoke_async(&mut conn)
+                .instrument(span)
+                .await
+                .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
+
+            if version >= 0 {
+                return Ok(Response::new(SetQueueResponse {
+                    version: version as u64,
+                }));
+            }
+
+            // Conditional writes must not be re-validated against a newer queue
+            if inner.expected_version.is_some() {
+                return Err(Status::aborted("queue was modified concurrently"));
+            }
+        }
+
+        Err(Status::aborted("queue was modified concurrently"))
+    }
+
+    async fn add_entity(
+        &self,
+        request: Request<AddEntityRequest>,
+    ) -> Result<Response<AddEntityResponse>, Status> {
+        debug!("received add_entity request: {:?}", request);
+
+        let user = user_from_request(&request)
+            .ok_or_else(|| Status::unauthenticated("user not authenticated"))?;
+
+        if user.email.is_empty() {
+            return Err(Status::unauthenticated("user email is required"));
+        }
+
+        let inner = request.into_inner();
+        let entity = inner
+            .entity
+            .ok_or_else(|| Status::invalid_argument("entity is required"))?;
+
+        if entity.id != user.email {
+            return Err(Status::permission_denied(format!(
+                "users can only add or modify entities with their email as the ID ({})",
+                user.email
+            )));
         }
 
-        let _: i64 = conn
-            .del(&key)
-            .instrument(info_span!("redis", cmd = "DEL", key = %key))
+        let key = queue_key(inner.id.clone());
+        let version_key = version_key(inner.id.clone());
+        let item = serde_json::to_string(&entity)
+            .map_err(|e| Status::internal(format!("failed to encode entity: {e}")))?;
+
+        let mut conn = self.redis.clone();
+        let (position, version): (i64, u64) = ADD_ENTITY
+            .key(&key)
+            .key(&version_key)
+            .arg(&entity.id)
+            .arg(item)
+            .arg(&inner.id)
+            .invoke_async(&mut conn)
+            .instrument(info_span!("redis", cmd = "EVALSHA", key = %key))
             .await
-            .map_err(|e| Status::internal(format!("Redis error on delete: {e}")))?;
+            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
 
-        if inner.entities.is_empty() {
-            return Ok(Response::new(SetQueueResponse {}));
+        if position < 0 {
+            return Err(Status::already_exists(
+                "users can only have one entity in a queue",
+            ));
         }
 
-        let entities: Vec<String> = inner
-            .entities
-            .into_iter()
-            .filter_map(|entity| serde_json::to_string(&entity).ok())
-            .collect();
+        Ok(Response::new(AddEntityResponse { position, version }))
+    }
+
+    async fn remove_entity(
+        &self,
+        request: Request<RemoveEntityRequest>,
+    ) -> Result<Response<RemoveEntityResponse>, Status> {
+        debug!("received remove_entity request: {:?}", request);
 
-        let span = info_span!("redis", cmd = "RPUSH", key = %key, count = entities.len());
-        let _: i64 = conn
-            .rpush(&key, entities)
-            .instrument(span)
+        let user = user_from_request(&request)
+            .ok_or_else(|| Status::unauthenticated("user not authenticated"))?;
+
+        if user.email.is_empty() {
+            return Err(Status::unauthenticated("user email is required"));
+        }
+
+        let inner = request.into_inner();
+        if inner.entity_id != user.email {
+            return Err(Status::permission_denied(
+                "users cannot remove entities that don't belong to them",
+            ));
+        }
+
+        let key = queue_key(inner.id.clone());
+        let version_key = version_key(inner.id.clone());
+        let mut conn = self.redis.clone();
+        let (removed, version): (i64, u64) = REMOVE_ENTITIES
+            .key(&key)
+            .key(&version_key)
+            .arg(&inner.entity_id)
+            .arg("0")
+            .arg(&inner.id)
+            .invoke_async(&mut conn)
+            .instrument(info_span!("redis", cmd = "EVALSHA", key = %key))
             .await
-            .map_err(|e| Status::internal(format!("Redis error on push: {e}")))?;
+            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
+
+        Ok(Response::new(RemoveEntityResponse {
+            removed: removed > 0,
+            version,
+        }))
+    }
+
+    async fn remove_entities_where(
+        &self,
+        request: Request<RemoveEntitiesWhereRequest>,
+    ) -> Result<Response<RemoveEntitiesWhereResponse>, Status> {
+        debug!("received remove_entities_where request: {:?}", request);
+
+        let user = user_from_request(&request)
+            .ok_or_else(|| Status::unauthenticated("user not authenticated"))?;
+
+        if user.email.is_empty() {
+            return Err(Status::unauthenticated("user email is required"));
+        }
+
+        let inner = request.into_inner();
+        let filter = inner
+            .filter
+            .ok_or_else(|| Status::invalid_argument("filter is required"))?;
+
+        if filter.entity_id.replace(' ', "") != user.email.replace(' ', "") {
+            return Err(Status::permission_denied(
+                "users cannot remove entities that don't belong to them",
+            ));
+        }
+
+        let key = queue_key(inner.id.clone());
+        let version_key = version_key(inner.id.clone());
+        let mut conn = self.redis.clone();
+        let (removed, version): (i64, u64) = REMOVE_ENTITIES
+            .key(&key)
+            .key(&version_key)
+            .arg(&filter.entity_id)
+            .arg("1")
+            .arg(&inner.id)
+            .invoke_async(&mut conn)
+            .instrument(info_span!("redis", cmd = "EVALSHA", key = %key))
+            .await
+            .map_err(|e| Status::internal(format!("Redis error: {e}")))?;
 
-        Ok(Response::new(SetQueueResponse {}))
+        Ok(Response::new(RemoveEntitiesWhereResponse { removed, version }))
     }
 }
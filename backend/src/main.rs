@@ -83,6 +83,10 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
     let redis_connection = client.get_multiplexed_async_connection().await.unwrap();
 
     let queue_service = api::queue::QueueService::new(redis_connection);
+    if let Err(error) = queue_service.index_entities().await {
+        error!("failed to index queue entities: {}", error);
+        std::process::exit(1);
+    }
 
     let reflection_service = tonic_reflection::server::Builder::configure()
         .register_encoded_file_descriptor_set(proto::FILE_DESCRIPTOR_SET)
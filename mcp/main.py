@@ -1,9 +1,21 @@
+import asyncio
+
 from src.tools import mcp
+from src.channel import pool
 from src import cfg
+from src.tracing import setup_tracing
+
+async def main():
+    setup_tracing(cfg.tracing)
+
+    try:
+        await mcp.run_async(
+            transport=cfg.server.transport,
+            host=cfg.server.host,
+            port=cfg.server.port
+        )
+    finally:
+        await pool.close()
 
 if __name__ == "__main__":
-    mcp.run(
-        transport=cfg.server.transport,
-        host=cfg.server.host,
-        port=cfg.server.port
-    )
+    asyncio.run(main())
@@ -1,2 +1,4 @@
 from .tools import *
-from .config import *
\ No newline at end of file
+from .config import *
+from .channel import *
+from .schema import *
\ No newline at end of file
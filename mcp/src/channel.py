@@ -0,0 +1,112 @@
+from asyncio import Task, CancelledError, create_task, gather, sleep
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import List, Optional
+
+from grpc import ChannelConnectivity
+from grpc.aio import Channel, insecure_channel
+from loguru import logger
+
+from .config import cfg, BackendConfig
+
+# States from which a channel is replaced rather than left to reconnect with backoff
+_UNHEALTHY = (ChannelConnectivity.TRANSIENT_FAILURE, ChannelConnectivity.SHUTDOWN)
+
+
+@dataclass
+class _Slot:
+    channel: Optional[Channel] = None
+    last_used: float = field(default_factory=monotonic)
+
+
+class ChannelPool:
+    """
+    ChannelPool holds a fixed number of long-lived gRPC channels to the backend which
+    are handed out round-robin. Channels are opened lazily on the running event loop,
+    replaced when they report an unhealthy connectivity state and closed by a reaper
+    task once they have been idle for longer than `idle_timeout`.
+    """
+
+    def __init__(self, target: str, size: int, options: list[tuple[str, int]], idle_timeout: float):
+        self._target = target
+        self._options = options
+        self._idle_timeout = idle_timeout
+        self._slots: List[_Slot] = [_Slot() for _ in range(max(size, 1))]
+        self._next = 0
+        self._closed = False
+        self._reaper: Optional[Task] = None
+        # Channels that have been swapped out but may still be carrying in-flight calls
+        self._retiring: set[Task] = set()
+
+    @classmethod
+    def from_config(cls, config: BackendConfig) -> "ChannelPool":
+        return cls(
+            target=config.url,
+            size=config.pool_size,
+            options=config.channel_options,
+            idle_timeout=config.idle_timeout,
+        )
+
+    def _retire(self, slot: _Slot):
+        if slot.channel is None:
+            return
+
+        task = create_task(slot.channel.close(grace=cfg.backend.timeout))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+        slot.channel = None
+
+    def channel(self) -> Channel:
+        """
+        channel returns the next channel in the pool, (re)connecting it if necessary.
+        It must be called from within the event loop that will use the channel.
+        """
+        if self._closed:
+            raise RuntimeError("channel pool is closed")
+
+        slot = self._slots[self._next]
+        self._next = (self._next + 1) % len(self._slots)
+
+        if slot.channel is not None and (state := slot.channel.get_state()) in _UNHEALTHY:
+            logger.warning(f"replacing backend channel in state {state.name}")
+            self._retire(slot)
+
+        if slot.channel is None:
+            slot.channel = insecure_channel(self._target, options=self._options)
+            slot.channel.get_state(try_to_connect=True)
+
+        if self._reaper is None:
+            self._reaper = create_task(self._reap())
+
+        slot.last_used = monotonic()
+        return slot.channel
+
+    async def _reap(self):
+        interval = max(self._idle_timeout / 2, 1.0)
+        while True:
+            await sleep(interval)
+            now = monotonic()
+            for slot in self._slots:
+                if slot.channel is not None and now - slot.last_used > self._idle_timeout:
+                    logger.debug("closing idle backend channel")
+                    self._retire(slot)
+
+    async def close(self):
+        """
+        close closes every open channel. The pool cannot be used afterwards.
+        """
+        self._closed = True
+
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except CancelledError:
+                pass
+
+        for slot in self._slots:
+            self._retire(slot)
+        await gather(*self._retiring)
+
+
+pool = ChannelPool.from_config(cfg.backend)
@@ -1,3 +1,7 @@
+from typing import Literal
+
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SpanExporter
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -6,11 +10,28 @@ class BackendConfig(BaseSettings):
 
     host: str = "localhost"
     port: int = 8001
+    # Deadline, in seconds, applied to every backend RPC
+    timeout: float = 10.0
+
+    # Channel pool settings, see `ChannelPool`
+    pool_size: int = 4
+    keepalive_time_ms: int = 30_000
+    keepalive_timeout_ms: int = 10_000
+    idle_timeout: float = 300.0
 
     @property
     def url(self) -> str:
         return f"{self.host}:{self.port}"
 
+    @property
+    def channel_options(self) -> list[tuple[str, int]]:
+        return [
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+
     
 class ServerConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="server_")
@@ -20,8 +41,33 @@ class ServerConfig(BaseSettings):
     port: int = 8002
 
 
+class TracingConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="tracing_")
+
+    # Where spans are exported to if tracing has not been set up by auto-instrumentation.
+    # "otlp" is configured by the standard OTEL_EXPORTER_OTLP_* variables.
+    exporter: Literal["none", "otlp", "console", "file"] = "none"
+    file_path: str = "traces.jsonl"
+    service_name: str = "queue-mcp"
+
+    @property
+    def span_exporter(self) -> SpanExporter | None:
+        match self.exporter:
+            case "otlp":
+                return OTLPSpanExporter()
+            case "console":
+                return ConsoleSpanExporter()
+            case "file":
+                return ConsoleSpanExporter(
+                    out=open(self.file_path, "a"),
+                    formatter=lambda span: span.to_json(indent=None) + "\n",
+                )
+        return None
+
+
 class Config(BaseModel):
     server: ServerConfig = ServerConfig()
     backend: BackendConfig = BackendConfig()
+    tracing: TracingConfig = TracingConfig()
 
 cfg = Config()
\ No newline at end of file
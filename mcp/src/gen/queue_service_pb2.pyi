@@ -16,25 +16,145 @@ class Entity(_message.Message):
     def __init__(self, id: _Optional[str] = ..., name: _Optional[str] = ...) -> None: ...
 
 class GetQueueRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "page_size", "page_token", "offset")
     ID_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
     id: str
-    def __init__(self, id: _Optional[str] = ...) -> None: ...
+    page_size: int
+    page_token: str
+    offset: int
+    def __init__(self, id: _Optional[str] = ..., page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., offset: _Optional[int] = ...) -> None: ...
 
 class GetQueueResponse(_message.Message):
-    __slots__ = ("entities",)
+    __slots__ = ("entities", "version", "next_page_token", "total_size")
     ENTITIES_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_SIZE_FIELD_NUMBER: _ClassVar[int]
     entities: _containers.RepeatedCompositeFieldContainer[Entity]
-    def __init__(self, entities: _Optional[_Iterable[_Union[Entity, _Mapping]]] = ...) -> None: ...
+    version: int
+    next_page_token: str
+    total_size: int
+    def __init__(self, entities: _Optional[_Iterable[_Union[Entity, _Mapping]]] = ..., version: _Optional[int] = ..., next_page_token: _Optional[str] = ..., total_size: _Optional[int] = ...) -> None: ...
+
+class StreamQueueRequest(_message.Message):
+    __slots__ = ("id", "batch_size")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    id: str
+    batch_size: int
+    def __init__(self, id: _Optional[str] = ..., batch_size: _Optional[int] = ...) -> None: ...
+
+class StreamQueueResponse(_message.Message):
+    __slots__ = ("entities", "offset", "version")
+    ENTITIES_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    entities: _containers.RepeatedCompositeFieldContainer[Entity]
+    offset: int
+    version: int
+    def __init__(self, entities: _Optional[_Iterable[_Union[Entity, _Mapping]]] = ..., offset: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
+
+class GetPositionRequest(_message.Message):
+    __slots__ = ("id", "entity_id")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    id: str
+    entity_id: str
+    def __init__(self, id: _Optional[str] = ..., entity_id: _Optional[str] = ...) -> None: ...
+
+class GetPositionResponse(_message.Message):
+    __slots__ = ("entity", "position", "length", "version")
+    ENTITY_FIELD_NUMBER: _ClassVar[int]
+    POSITION_FIELD_NUMBER: _ClassVar[int]
+    LENGTH_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    entity: Entity
+    position: int
+    length: int
+    version: int
+    def __init__(self, entity: _Optional[_Union[Entity, _Mapping]] = ..., position: _Optional[int] = ..., length: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
+
+class ListQueuesForEntityRequest(_message.Message):
+    __slots__ = ("entity_id",)
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    entity_id: str
+    def __init__(self, entity_id: _Optional[str] = ...) -> None: ...
+
+class ListQueuesForEntityResponse(_message.Message):
+    __slots__ = ("queue_ids",)
+    QUEUE_IDS_FIELD_NUMBER: _ClassVar[int]
+    queue_ids: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, queue_ids: _Optional[_Iterable[str]] = ...) -> None: ...
 
 class SetQueueRequest(_message.Message):
-    __slots__ = ("id", "entities")
+    __slots__ = ("id", "entities", "expected_version")
     ID_FIELD_NUMBER: _ClassVar[int]
     ENTITIES_FIELD_NUMBER: _ClassVar[int]
+    EXPECTED_VERSION_FIELD_NUMBER: _ClassVar[int]
     id: str
     entities: _containers.RepeatedCompositeFieldContainer[Entity]
-    def __init__(self, id: _Optional[str] = ..., entities: _Optional[_Iterable[_Union[Entity, _Mapping]]] = ...) -> None: ...
+    expected_version: int
+    def __init__(self, id: _Optional[str] = ..., entities: _Optional[_Iterable[_Union[Entity, _Mapping]]] = ..., expected_version: _Optional[int] = ...) -> None: ...
 
 class SetQueueResponse(_message.Message):
-    __slots__ = ()
-    def __init__(self) -> None: ...
+    __slots__ = ("version",)
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    version: int
+    def __init__(self, version: _Optional[int] = ...) -> None: ...
+
+class AddEntityRequest(_message.Message):
+    __slots__ = ("id", "entity")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    ENTITY_FIELD_NUMBER: _ClassVar[int]
+    id: str
+    entity: Entity
+    def __init__(self, id: _Optional[str] = ..., entity: _Optional[_Union[Entity, _Mapping]] = ...) -> None: ...
+
+class AddEntityResponse(_message.Message):
+    __slots__ = ("position", "version")
+    POSITION_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    position: int
+    version: int
+    def __init__(self, position: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
+
+class RemoveEntityRequest(_message.Message):
+    __slots__ = ("id", "entity_id")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    id: str
+    entity_id: str
+    def __init__(self, id: _Optional[str] = ..., entity_id: _Optional[str] = ...) -> None: ...
+
+class RemoveEntityResponse(_message.Message):
+    __slots__ = ("removed", "version")
+    REMOVED_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    removed: bool
+    version: int
+    def __init__(self, removed: bool = ..., version: _Optional[int] = ...) -> None: ...
+
+class EntityFilter(_message.Message):
+    __slots__ = ("entity_id",)
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    entity_id: str
+    def __init__(self, entity_id: _Optional[str] = ...) -> None: ...
+
+class RemoveEntitiesWhereRequest(_message.Message):
+    __slots__ = ("id", "filter")
+    ID_FIELD_NUMBER: _ClassVar[int]
+    FILTER_FIELD_NUMBER: _ClassVar[int]
+    id: str
+    filter: EntityFilter
+    def __init__(self, id: _Optional[str] = ..., filter: _Optional[_Union[EntityFilter, _Mapping]] = ...) -> None: ...
+
+class RemoveEntitiesWhereResponse(_message.Message):
+    __slots__ = ("removed", "version")
+    REMOVED_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    removed: int
+    version: int
+    def __init__(self, removed: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from mcp import types as mt
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+
+TOOL_LATENCY = Histogram(
+    "mcp_tool_call_duration_seconds",
+    "Time taken to call a tool, including the backend RPC",
+    ["tool"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+TOOL_ERRORS = Counter(
+    "mcp_tool_call_errors_total",
+    "Tool calls which failed",
+    ["tool"],
+)
+
+
+class MetricsMiddleware(Middleware):
+    """
+    MetricsMiddleware records the latency of every tool call and counts those which fail.
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, object],
+    ):
+        tool = context.message.name
+        start = perf_counter()
+        try:
+            return await call_next(context)
+        except Exception:
+            TOOL_ERRORS.labels(tool).inc()
+            raise
+        finally:
+            TOOL_LATENCY.labels(tool).observe(perf_counter() - start)
+
+
+async def serve_metrics(request: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+class QueuePosition(BaseModel):
+    """
+    QueuePosition describes where an entity is in a queue.
+    """
+    entity_id: str
+    found: bool = Field(description="Whether the entity is in the queue")
+    name: Optional[str] = None
+    position: Optional[int] = Field(default=None, description="Position in the queue, starting at 1 for the front")
+    length: int = Field(description="Number of entities in the queue")
+
+class QueueEntity(BaseModel):
+    """
+    QueueEntity is an entity in a queue.
+    """
+    id: str
+    name: str
+
+class QueuePage(BaseModel):
+    """
+    QueuePage is a run of consecutive entities from a queue.
+    """
+    entities: List[QueueEntity]
+    offset: int = Field(description="Position, starting at 0, of the first entity in the page")
+    total: int = Field(description="Number of entities in the queue")
+    next_offset: Optional[int] = Field(default=None, description="Offset of the next page, absent on the last page")
+
+class EntityAdded(BaseModel):
+    """
+    EntityAdded describes an entity that has been added to a queue.
+    """
+    entity_id: str
+    name: str
+    position: int = Field(description="Position in the queue, starting at 1 for the front")
+
+class EntityRemoved(BaseModel):
+    """
+    EntityRemoved describes the outcome of removing an entity from a queue.
+    """
+    entity_id: str
+    removed: bool = Field(description="Whether the entity was in the queue")
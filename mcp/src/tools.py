@@ -1,53 +1,126 @@
-from typing import Annotated, List
+from typing import Annotated
 
 from fastmcp import FastMCP
 from fastmcp.server.dependencies import get_http_headers
-from grpc import insecure_channel, RpcError
+from grpc import RpcError
 from loguru import logger
 
+from .channel import pool
 from .config import cfg
-from .gen.queue_service_pb2 import GetQueueRequest, GetQueueResponse, SetQueueRequest, Entity
+from .metrics import MetricsMiddleware, serve_metrics
+from .tracing import TracingMiddleware, trace_context
+from .schema import QueuePosition, QueueEntity, QueuePage, EntityAdded, EntityRemoved
+from .gen.queue_service_pb2 import (
+    GetQueueRequest,
+    GetQueueResponse,
+    GetPositionRequest,
+    GetPositionResponse,
+    AddEntityRequest,
+    AddEntityResponse,
+    RemoveEntityRequest,
+    RemoveEntityResponse,
+    Entity,
+)
 from .gen.queue_service_pb2_grpc import QueueStub
 
 mcp = FastMCP("My MCP Server")
+mcp.add_middleware(MetricsMiddleware())
+mcp.add_middleware(TracingMiddleware())
+mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)(serve_metrics)
 
 
-# This translates to a string but only because I would prefer to spend the effort on
-# other things for now
-@mcp.tool
-def get_queue(
-    queue_id: Annotated[str, "The ID of the queue"]
-) -> str:
+# Bounds on how much of a queue is returned by a single get_queue call
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+def metadata() -> tuple[tuple[str, str], ...]:
+    """
+    metadata returns the gRPC metadata for a backend call, being the request's HTTP
+    headers, which identify the user, and the current trace context.
+    """
+    return tuple((get_http_headers() | trace_context()).items())
+
+@mcp.tool(annotations={"readOnlyHint": True})
+async def get_queue(
+    queue_id: Annotated[str, "The ID of the queue"],
+    offset: Annotated[int, "The position, starting at 0, of the first entity to return"] = 0,
+    limit: Annotated[int, f"The maximum number of entities to return, at most {MAX_LIMIT}"] = DEFAULT_LIMIT,
+) -> QueuePage:
     """
     get_queue retrieves the specified queue. The response includes entity IDs and names.
+    Long queues are returned a page at a time, pass next_offset as offset to read further.
+    To find where a single entity is in the queue, use get_position instead.
     """
     
-    headers = get_http_headers()
-
-    with insecure_channel(cfg.backend.url) as channel:
-        stub = QueueStub(channel)
-
-        try:
-            response: GetQueueResponse = stub.GetQueue(
-                GetQueueRequest(id=queue_id), 
-                metadata=tuple((key, value) for key, value in headers.items())
-            )
-        except RpcError as e:
-            logger.error("failed to get queue: " + str(e))
-            raise e
-
-    if not response.entities:
-        return "No entities in queue"
-    
-    # Return formatted list showing both ID and name
-    entities_list = [f"{entity.name} (ID: {entity.id})" for entity in response.entities]
-    return "Queue contents:\n" + "\n".join(f"  - {item}" for item in entities_list)
+    headers = metadata()
+
+    stub = QueueStub(pool.channel())
+
+    try:
+        response: GetQueueResponse = await stub.GetQueue(
+            GetQueueRequest(
+                id=queue_id,
+                offset=max(offset, 0),
+                page_size=min(max(limit, 1), MAX_LIMIT)
+            ),
+            metadata=headers,
+            timeout=cfg.backend.timeout
+        )
+    except RpcError as e:
+        logger.error("failed to get queue: " + str(e))
+        raise e
+
+    first = max(offset, 0)
+    return QueuePage(
+        entities=[QueueEntity(id=entity.id, name=entity.name) for entity in response.entities],
+        offset=first,
+        total=response.total_size,
+        next_offset=first + len(response.entities) if response.next_page_token else None
+    )
+
+@mcp.tool(annotations={"readOnlyHint": True})
+async def get_position(
+    queue_id: Annotated[str, "The ID of the queue"],
+    entity_id: Annotated[str, "The ID of the entity to locate"]
+) -> QueuePosition:
+    """
+    get_position finds where an entity is in the specified queue without retrieving the
+    rest of the queue. Positions start at 1 for the front of the queue.
+    """
+
+    headers = metadata()
+
+    stub = QueueStub(pool.channel())
+
+    try:
+        response: GetPositionResponse = await stub.GetPosition(
+            GetPositionRequest(
+                id=queue_id,
+                entity_id=entity_id
+            ),
+            metadata=headers,
+            timeout=cfg.backend.timeout
+        )
+    except RpcError as e:
+        logger.error("failed to get position: " + str(e))
+        raise e
+
+    if not response.HasField("entity"):
+        return QueuePosition(entity_id=entity_id, found=False, length=response.length)
+
+    return QueuePosition(
+        entity_id=entity_id,
+        found=True,
+        name=response.entity.name,
+        position=response.position + 1,
+        length=response.length
+    )
 
 @mcp.tool
-def add_to_queue(
+async def add_to_queue(
     queue_id: Annotated[str, "The ID of the queue"],
     entity_id: Annotated[str, "The ID of the entity to add to the queue. Must be a valid, non-empty identifier."],
-    entity_name: Annotated[str, "The name of the entity to add to the queue"]) -> str:
+    entity_name: Annotated[str, "The name of the entity to add to the queue"]) -> EntityAdded:
     """
     add_to_queue adds an entity to the specified queue. A valid entity_id is required.
     """
@@ -57,75 +130,56 @@ def add_to_queue(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    headers_dict = get_http_headers()
-    headers = tuple((key, value) for key, value in headers_dict.items())
-
-    with insecure_channel(cfg.backend.url) as channel:
-        stub = QueueStub(channel)
-
-        try:
-            response, _ = stub.GetQueue.with_call(
-                GetQueueRequest(id=queue_id),
-                metadata=headers
-            )
-        except RpcError as e:
-            logger.error("failed to get queue: " + str(e))
-            raise e
-
-        try:
-            _, _ = stub.SetQueue.with_call(
-                SetQueueRequest(
-                    id=queue_id,
-                    entities=[*response.entities, Entity(
-                        id=entity_id,
-                        name=entity_name
-                    )]
-                ),
-                metadata=headers
-            )
-        except RpcError as e:
-            logger.error("failed to set queue: " + str(e))
-            raise e
-
-    return f"Entity '{entity_name}' (ID: {entity_id}) was successfully added to the queue"
+    headers = metadata()
+
+    stub = QueueStub(pool.channel())
+
+    try:
+        response: AddEntityResponse = await stub.AddEntity(
+            AddEntityRequest(
+                id=queue_id,
+                entity=Entity(
+                    id=entity_id,
+                    name=entity_name
+                )
+            ),
+            metadata=headers,
+            timeout=cfg.backend.timeout
+        )
+    except RpcError as e:
+        logger.error("failed to add entity: " + str(e))
+        raise e
+
+    return EntityAdded(
+        entity_id=entity_id,
+        name=entity_name,
+        position=response.position + 1
+    )
 
 @mcp.tool
-def remove_from_queue(
+async def remove_from_queue(
     queue_id: Annotated[str, "The ID of the queue"],
     entity_id: Annotated[str, "The ID of the entity to remove from the queue"]
-    ) -> str:
+    ) -> EntityRemoved:
     """
     remove_from_queue removes an entity from the specified queue
     """
 
-    headers = tuple((key, value) for key, value in get_http_headers().items())
-
-    with insecure_channel(cfg.backend.url) as channel:
-        stub = QueueStub(channel)
-
-        queue: List[Entity] = []
-        try:
-            response: GetQueueResponse = stub.GetQueue(
-                GetQueueRequest(id=queue_id),
-                metadata=headers
-            )
-            for entity in response.entities:
-                if entity.id != entity_id:
-                    queue.append(entity)
-        except RpcError as e:
-            logger.error("failed to get queue: " + str(e))
-            raise e
-
-        try:
-            _ = stub.SetQueue(
-                SetQueueRequest(
-                    id=queue_id,
-                    entities=queue
-                ),
-                metadata=headers
-            )
-        except RpcError as e:
-            logger.error("failed to set queue: " + str(e))
-            raise e
-
-    return f"{entity_id} was successfully removed from the queue"
+    headers = metadata()
+
+    stub = QueueStub(pool.channel())
+
+    try:
+        response: RemoveEntityResponse = await stub.RemoveEntity(
+            RemoveEntityRequest(
+                id=queue_id,
+                entity_id=entity_id
+            ),
+            metadata=headers,
+            timeout=cfg.backend.timeout
+        )
+    except RpcError as e:
+        logger.error("failed to remove entity: " + str(e))
+        raise e
+
+    return EntityRemoved(entity_id=entity_id, removed=response.removed)
@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from mcp import types as mt
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.trace import SpanKind
+
+if TYPE_CHECKING:
+    from .config import TracingConfig
+
+tracer = trace.get_tracer("queue.mcp")
+
+
+def setup_tracing(config: "TracingConfig"):
+    """
+    setup_tracing installs a tracer provider exporting to the configured exporter. Where a
+    provider has already been installed, e.g. by OpenTelemetry auto-instrumentation, it
+    is left in place.
+    """
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        return
+
+    exporter = config.span_exporter
+    if exporter is None:
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": config.service_name}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def trace_context() -> dict[str, str]:
+    """
+    trace_context returns the current trace context as headers, for propagation to the
+    backend.
+    """
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+class TracingMiddleware(Middleware):
+    """
+    TracingMiddleware records a span for every tool call. The caller's trace is taken
+    from the request's _meta, as clients sharing a session cannot set it per request in
+    the HTTP headers, falling back to the HTTP headers.
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, object],
+    ):
+        carrier = dict(get_http_headers(include_all=True))
+        if context.fastmcp_context is not None:
+            meta = context.fastmcp_context.request_context.meta
+            if meta is not None:
+                carrier |= {key: value for key, value in meta.model_dump(exclude_none=True).items() if isinstance(value, str)}
+
+        tool = context.message.name
+        with tracer.start_as_current_span(
+            f"tool {tool}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"tool.name": tool},
+        ):
+            return await call_next(context)
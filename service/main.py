@@ -1,22 +1,70 @@
+import argparse
 import asyncio
 import logging
+import signal
 
 from loguru import logger
 
-from src.worker import run_worker
-from src.api import run_api
-
 logging.basicConfig(level=logging.INFO)
-    
-async def main():
-    logger.info("starting service...")
+
+# Roles the service can be run in, so that the API and workers can be scaled separately
+ROLES = ("all", "api", "worker")
+
+def warn_unrelayed_streams(role: str):
+    """
+    warn_unrelayed_streams warns when streamed responses cannot carry their progress, as
+    requests are served by processes other than the worker generating the responses and
+    no relay between them has been configured.
+    """
+    from src.config import cfg
+    if cfg.streams.redis_url is None and (role != "all" or cfg.api.workers > 1):
+        logger.warning("STREAMS_REDIS_URL is not set, streamed responses will only carry their final event")
+
+async def main(role: str):
+    logger.info(f"starting service in role {role}...")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    warn_unrelayed_streams(role)
+
+    # Imported by role so that each process only loads what it runs. The API is listed
+    # first as it is stopped first, its in-flight requests being answered by the worker.
+    tasks: list[asyncio.Task] = []
+    if role in ("all", "api"):
+        from src.api import run_api
+        tasks.append(asyncio.create_task(run_api()))
+    if role in ("all", "worker"):
+        from src.worker import run_worker
+        tasks.append(asyncio.create_task(run_worker()))
+    if role == "worker":
+        # Without the API, metrics are served on a port of their own
+        from prometheus_client import start_http_server
+        from src.config import cfg
+        from src.metrics import registry
+        start_http_server(cfg.metrics.port, registry=registry())
 
     await asyncio.wait(
-        [run_worker(), run_api()],
+        [*tasks, asyncio.create_task(stop.wait())],
         return_when=asyncio.FIRST_COMPLETED,
     )
 
+    logger.info("stopping service...")
+    for task in tasks:
+        task.cancel()
+        await asyncio.wait([task])
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
     logger.info("service stopped.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Runs the conversation API and/or Temporal worker.")
+    parser.add_argument("role", nargs="?", choices=ROLES, default="all", help="the parts of the service to run, defaults to all")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.role))
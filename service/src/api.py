@@ -1,13 +1,22 @@
+from asyncio import CancelledError, create_task, shield, to_thread
+from collections import OrderedDict
+from math import inf
+from multiprocessing import get_context
+from time import time
 from typing import Optional
+import hashlib
 
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
 from uvicorn import Config, Server
+import uvicorn
 from loguru import logger
 import jwt
 
 from .routes import messages, user
 from .config import cfg
+from .metrics import MetricsMiddleware, serve_metrics
+from .tracing import TracingMiddleware
 from . import context
 
 
@@ -24,42 +33,141 @@ def split_bearer_token(auth_header: str) -> Optional[str]:
 
     return header_split[1]
 
-class HeaderPropagationMiddleware(BaseHTTPMiddleware):
+def name_from_claims(claims: dict) -> Optional[str]:
+    return (
+        claims.get('name') or
+        claims.get('given_name') or
+        claims.get('nickname') or
+        claims.get('preferred_username')
+    )
+
+class ClaimsCache:
+    """
+    ClaimsCache holds the names decoded from recently seen bearer tokens, keyed by a hash
+    of the token so that tokens themselves are not kept. Entries are dropped once their
+    token expires and, beyond `size`, the least recently used are dropped.
+    """
+
+    def __init__(self, size: int):
+        self._size = max(size, 1)
+        self._entries: OrderedDict[bytes, tuple[Optional[str], float]] = OrderedDict()
+
+    def name(self, token: str) -> Optional[str]:
+        """
+        name returns the user's name from the token's claims. Signatures are not verified
+        as tokens are verified before requests reach the service.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time():
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        # Tokens which cannot be decoded are cached too so the failure is only logged once
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except Exception as e:
+            logger.warning(f"failed to decode JWT: {e}")
+            claims = {}
+
+        name = name_from_claims(claims)
+        exp = claims.get('exp')
+        self._entries[key] = (name, float(exp) if isinstance(exp, (int, float)) else inf)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+        return name
+
+# ASGI header names are lowercase
+PROPAGATED_HEADERS = {b'x-auth-request-user', b'x-auth-request-email', b'x-auth-request-groups', b'authorization'}
+
+def _header(headers: dict[bytes, bytes], key: bytes) -> Optional[str]:
+    value = headers.get(key)
+    return value.decode('latin-1') if value is not None else None
+
+class HeaderPropagationMiddleware:
     """
     Middleware to capture incoming headers and store them in contextvars.
     
     This enables headers to be accessed anywhere in the request lifecycle
-    without explicit parameter passing.
+    without explicit parameter passing. It is implemented as plain ASGI middleware so
+    that responses, including streamed ones, pass straight through.
     """
-    async def dispatch(self, request: Request, call_next):
-        context.auth_user.set(request.headers.get('x-auth-request-user'))
-        context.auth_email.set(request.headers.get('x-auth-request-email'))
-        context.auth_groups.set(request.headers.get('x-auth-request-groups'))
-        
-        auth_header = request.headers.get('authorization')
-        if auth_header and (token := split_bearer_token(auth_header)):
-            try:
-                claims = jwt.decode(token, options={"verify_signature": False})
-                context.auth_name.set(
-                    claims.get('name') or
-                    claims.get('given_name') or
-                    claims.get('nickname') or
-                    claims.get('preferred_username')
-                )
-            except Exception as e:
-                logger.warning(f"failed to decode JWT: {e}")
+    def __init__(self, app: ASGIApp, claims_cache_size: int = 1024):
+        self.app = app
+        self.claims = ClaimsCache(claims_cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        headers: dict[bytes, bytes] = {}
+        for key, value in scope["headers"]:
+            if key in PROPAGATED_HEADERS:
+                headers[key] = value
 
+        context.auth_user.set(_header(headers, b'x-auth-request-user'))
+        context.auth_email.set(_header(headers, b'x-auth-request-email'))
+        context.auth_groups.set(_header(headers, b'x-auth-request-groups'))
+
+        auth_header = _header(headers, b'authorization')
+        if auth_header and (token := split_bearer_token(auth_header)):
+            context.auth_name.set(self.claims.name(token))
+
+        await self.app(scope, receive, send)
 
 app = FastAPI()
-app.add_middleware(HeaderPropagationMiddleware)
+app.add_middleware(HeaderPropagationMiddleware, claims_cache_size=cfg.api.claims_cache_size)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 app.include_router(messages.router)
 app.include_router(user.router)
+app.add_route("/metrics", serve_metrics, include_in_schema=False)
+
+def serve_api_workers():
+    """
+    serve_api_workers serves the API from `api.workers` processes sharing one socket.
+    Each process imports the app, and so builds its own config and connects its own
+    Temporal client on first use.
+    """
+    uvicorn.run("src.api:app", host=cfg.api.host, port=cfg.api.port, workers=cfg.api.workers, log_level="info")
 
 async def run_api():
+    """
+    run_api serves the API until cancelled, at which point in-flight requests are
+    allowed to complete before it returns.
+    """
+    if cfg.api.workers > 1:
+        await _run_api_workers()
+        return
+
     logger.info("starting API server...")
     config = Config(app=app, host=cfg.api.host, port=cfg.api.port, log_level="info")
     server = Server(config)
-    await server.serve()
\ No newline at end of file
+
+    serving = create_task(server.serve())
+    try:
+        await shield(serving)
+    except CancelledError:
+        server.should_exit = True
+        await serving
+        raise
+
+async def _run_api_workers():
+    logger.info(f"starting API server with {cfg.api.workers} processes...")
+    # uvicorn's supervisor handles signals so must be the main thread of a process. It is
+    # spawned rather than forked as this process may already hold gRPC channels.
+    supervisor = get_context("spawn").Process(target=serve_api_workers, name="api")
+    supervisor.start()
+
+    try:
+        await to_thread(supervisor.join)
+    except CancelledError:
+        # uvicorn shuts its workers down gracefully on SIGTERM
+        supervisor.terminate()
+        await to_thread(supervisor.join)
+        raise
+
+    if supervisor.exitcode != 0:
+        raise RuntimeError(f"API server exited with code {supervisor.exitcode}")
\ No newline at end of file
@@ -1,9 +1,12 @@
 from agents import set_default_openai_client, set_tracing_disabled, set_default_openai_api
 
+from ..tracing import setup_tracing
 from .config import Config
 
 cfg = Config()
 
+setup_tracing(cfg.tracing)
+
 set_default_openai_client(cfg.openai.client)
 
 # Ollama does not currently support the responses API
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from inspect import signature
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from loguru import logger
+from pydantic import BaseModel
+from temporalio.activity import _Definition
+
+from .tools import tool_context_headers
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+
+
+class ToolCache:
+    """
+    ToolCache holds the results of read-only tool calls for `ttl` seconds so repeated
+    questions about a queue are answered from memory. Entries are keyed by the tool, its
+    arguments and a local version of the queue which is bumped by every write tool call
+    made through the cache, so writes from this worker are seen immediately and those
+    from elsewhere within `ttl`. Only structured results are cached, errors never are.
+    """
+
+    def __init__(self, ttl: float, size: int):
+        self._ttl = ttl
+        self._size = max(size, 1)
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._versions: Dict[str, int] = {}
+
+    def _key(self, tool: str, arguments: dict[str, Any]) -> Hashable:
+        queue_id = arguments.get("queue_id")
+        return (
+            queue_id,
+            self._versions.get(queue_id, 0),
+            tool,
+            tuple(sorted((name, repr(value)) for name, value in arguments.items())),
+        )
+
+    def invalidate(self, queue_id: str | None):
+        """
+        invalidate makes every cached result for the queue unreachable. They are evicted
+        as they expire or fall off the end of the cache.
+        """
+        if queue_id is not None:
+            self._versions[queue_id] = self._versions.get(queue_id, 0) + 1
+
+    async def call(
+        self,
+        tool: str,
+        arguments: dict[str, Any],
+        read_only: bool,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        call returns the cached result of the tool call if there is one, otherwise it makes
+        the call and caches its result.
+        """
+        if not read_only:
+            try:
+                return await call()
+            finally:
+                self.invalidate(arguments.get("queue_id"))
+
+        key = self._key(tool, arguments)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > monotonic():
+            logger.debug(f"serving {tool} from the tool cache")
+            return entry.value
+
+        result = await call()
+
+        # The key is recomputed as a write during the call makes the result stale
+        if isinstance(result, BaseModel) and self._key(tool, arguments) == key:
+            self._entries[key] = _Entry(value=result, expires=monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+        return result
+
+    def wrap(self, fn: Callable, read_only: bool) -> Callable:
+        """
+        wrap returns a copy of the tool activity which calls through the cache. Calls made
+        without an authenticated user bypass it, as the backend would reject them.
+        """
+        name = _Definition.must_from_callable(fn).name
+        sig = signature(fn)
+
+        async def run(*args, **kwargs):
+            arguments = dict(sig.bind(*args, **kwargs).arguments)
+            tool_context = arguments.pop("tool_context", None)
+            if not tool_context_headers(tool_context).get("X-Auth-Request-Email"):
+                return await fn(*args, **kwargs)
+
+            return await self.call(name, arguments, read_only, lambda: fn(*args, **kwargs))
+
+        setattr(run, "__name__", fn.__name__)
+        setattr(run, "__doc__", fn.__doc__)
+        setattr(run, "__signature__", sig)
+        setattr(run, "__annotations__", getattr(fn, "__annotations__", {}))
+        _Definition._apply_to_callable(run, activity_name=name)
+        return run
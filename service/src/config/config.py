@@ -1,74 +1,191 @@
+from asyncio import Lock, sleep
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Coroutine, Any, List, Type, Optional
-from inspect import signature, Parameter
+from typing import Coroutine, Any, Callable, Dict, List, Literal, Optional, Union
+import hashlib
+import json
+from inspect import Parameter, Signature
 
 from loguru import logger
 from openai import AsyncOpenAI
 from agents import OpenAIProvider
 from agents.mcp import  MCPServerStreamableHttp, MCPServerStreamableHttpParams
 from agents.tool_context import ToolContext
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, create_model
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from temporalio.client import Client, TLSConfig
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
 from temporalio.common import RetryPolicy
 from temporalio.activity import _Definition
 from temporalio.contrib.openai_agents import OpenAIAgentsPlugin, ModelActivityParameters
 from temporalio.contrib.opentelemetry import TracingInterceptor
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SpanExporter
+from temporalio.worker import PollerBehaviorSimpleMaximum
 from mcp import Tool as MCPTool
+from mcp.types import CallToolRequest, CallToolRequestParams, CallToolResult, ClientRequest, TextContent
+from grpc.aio import Channel, insecure_channel
+from opentelemetry.trace import Status, StatusCode
+
+from ..gen.queue_service_pb2_grpc import QueueStub
+from ..metrics import TOOL_ERRORS, observe_tool
+from ..tracing import trace_context, trace_tool
+from ..schema.tools import ToolCatalog, tool_results
+from .cache import ToolCache
+from .sessions import SessionPool
+from .streaming import StreamingModelProvider
+from ..streams import RedisStreamBroker, StreamBroker
+from .tools import backend_activities, dynamic_tool_activity, tool_catalog_activity, tool_context_headers
 
 # as per https://json-schema.org/understanding-json-schema/reference/type
 json_schema_types_to_python: dict[str, type] = {
     "string": str,
     "number": float,
+    "integer": int,
     "object": dict,
     "array": list,
     "boolean": bool,
     "null": type(None)
 }
 
+# Number of earlier tool catalogs whose activities are kept for running conversations
+MAX_CATALOGS = 8
+
 class APIConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="api_")
 
     host: str = "0.0.0.0"
     port: int = 8003
+    # Number of processes serving the API, each with its own event loop
+    workers: int = 1
+    # Number of bearer tokens whose decoded claims are kept
+    claims_cache_size: int = 1024
 
 class BackendConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="backend_")
 
     url: str = "localhost:8001"
+    # Deadline, in seconds, applied to every backend RPC
+    timeout: float = 10.0
+    # Maximum number of RPCs a single request fans out concurrently
+    concurrency: int = 8
+
+    _channel: Channel | None = None
+    _activities: List[Callable] | None = None
+
+    @property
+    def stub(self) -> QueueStub:
+        """
+        stub returns an async client for the backend. The underlying channel is created
+        on first use and shared thereafter, so this must be used from a single event loop.
+        """
+        if self._channel is None:
+            self._channel = insecure_channel(self.url)
+        return QueueStub(self._channel)
+
+    async def init_tools(self):
+        """
+        init_tools exists for parity with `MCPConfig`. The backend's tools are defined
+        statically so there is nothing to fetch.
+        """
+
+    @property
+    def activities(self) -> List[Callable]:
+        """
+        activities returns the agent's tools as Temporal activities which call the backend
+        directly, bypassing the MCP server.
+        """
+        if self._activities is None:
+            self._activities = backend_activities(self)
+        return self._activities
 
-class Property(BaseModel):
-    name: str
-    description: str
-    title: str
-    type: Type
+    @property
+    def catalog(self) -> ToolCatalog:
+        return ToolCatalog(version="grpc")
+
+    def activities_for(self, catalog: ToolCatalog) -> List[Callable]:
+        return self.activities
 
-    def docstring(self) -> str:
-        return f"{self.name} ({self.type.__name__}): {self.description}"
+    async def watch_tools(self, interval: float):
+        """
+        watch_tools exists for parity with `MCPConfig`. The backend's tools never change.
+        """
+
+    @property
+    def read_only_tools(self) -> set[str]:
+        return {"get_queue", "get_position"}
+
+def json_schema_to_python(schema: dict[str, Any]) -> Any:
+    """
+    json_schema_to_python returns the Python type described by a JSON schema, falling back
+    to Any for schemas which cannot be expressed, such as references.
+    """
+    if "anyOf" in schema:
+        return Union[tuple(json_schema_to_python(option) for option in schema["anyOf"])]
+
+    t = schema.get("type")
+    if isinstance(t, list):
+        return Union[tuple(json_schema_types_to_python.get(option, Any) for option in t)]
+    if t == "array":
+        return List[json_schema_to_python(schema.get("items", {}))]
+    return json_schema_types_to_python.get(t, Any)
+
+def json_schema_to_model(name: str, schema: dict[str, Any]) -> type[BaseModel]:
+    """
+    json_schema_to_model creates a model with a field for each property of an object JSON
+    schema. Properties which are not required are optional and default to None.
+    """
+    fields: dict[str, Any] = {}
+    required = schema.get("required", [])
+    for prop_name, prop in schema.get("properties", {}).items():
+        t = json_schema_to_python(prop)
+        description = prop.get("description")
+        if prop_name in required:
+            fields[prop_name] = (t, Field(description=description))
+        else:
+            fields[prop_name] = (Optional[t], Field(default=None, description=description))
+
+    return create_model(name, __doc__=schema.get("description"), **fields)
+
+def tool_catalog_version(tools: List[MCPTool]) -> str:
+    """
+    tool_catalog_version returns a digest identifying the definitions of the given tools.
+    """
+    definitions = json.dumps([tool.model_dump(mode="json") for tool in tools], sort_keys=True)
+    return hashlib.sha256(definitions.encode()).hexdigest()[:16]
 
 class MCPConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="mcp_")
 
     address: str = "http://localhost:8002/mcp"
+    # Sessions unused for this many seconds are closed
+    session_idle_timeout: float = 300.0
+    # Sessions unused for this many seconds are pinged before being reused
+    session_health_check_interval: float = 30.0
+    session_health_check_timeout: float = 5.0
+    # Upper bound on open sessions, one of which is held per authenticated user
+    max_sessions: int = 100
+
     _tools: List[MCPTool] = []
+    _version: str = ""
+    # The current definition of each tool and the activity built from it
+    _definitions: Dict[str, tuple[MCPTool, Callable]] = {}
+    _activities: List[Callable] | None = None
+    # Activities of earlier catalogs still referred to by running conversations
+    _catalogs: OrderedDict[str, List[Callable]] = OrderedDict()
+    _sessions: SessionPool | None = None
 
-    def _extract_auth_headers(self, auth_ctx: Any) -> dict[str, str]:
-        """Extract auth headers from AuthContext (dict or object)."""
-        headers = {}
-        if not auth_ctx:
-            return headers
-        
-        # Handle both dict and object attribute access
-        get_attr = auth_ctx.get if isinstance(auth_ctx, dict) else lambda k: getattr(auth_ctx, k, None)
-        
-        if user := get_attr('auth_user'):
-            headers['X-Auth-Request-User'] = user
-        if email := get_attr('auth_email'):
-            headers['X-Auth-Request-Email'] = email
-        if groups := get_attr('auth_groups'):
-            headers['X-Auth-Request-Groups'] = groups
-        
-        return headers
+    @property
+    def sessions(self) -> SessionPool:
+        if self._sessions is None:
+            self._sessions = SessionPool(
+                address=self.address,
+                idle_timeout=self.session_idle_timeout,
+                health_check_interval=self.session_health_check_interval,
+                health_check_timeout=self.session_health_check_timeout,
+                max_sessions=self.max_sessions,
+            )
+        return self._sessions
 
     def _mcp_tool_to_activity(self, tool: MCPTool):
         """
@@ -79,74 +196,84 @@ class MCPConfig(BaseSettings):
         activity definition which enables simple translation to a function tool via the method
         supplied by the Temporal library.
 
-        A potential enhnacement would be to use the `create_model` function from Pydantic but this
-        adds some complexity to an already overly complex system.
+        The tool's input schema is compiled into a model which arguments are validated against
+        before calling the tool, and its structured results are deserialised into the models in
+        `src.schema.tools`, or one compiled from its output schema, so that the agent receives
+        compact data rather than the whole MCP response.
         """
+        input_model = json_schema_to_model(f"{tool.name}_input", tool.inputSchema)
 
-        input_properties: List[Property] = []
+        output_schema = tool.outputSchema or {}
+        # FastMCP wraps results that are not objects in a {"result": ...} object
+        wrapped = output_schema.get("x-fastmcp-wrap-result", False)
+        if wrapped:
+            output_schema = output_schema.get("properties", {}).get("result", {})
 
-        for name, prop in tool.inputSchema.get("properties", {}).items():
-            t = json_schema_types_to_python.get(prop.get("type"), None)
-            required = name in tool.inputSchema.get("required", [])
+        output_model: type[BaseModel] | None = tool_results.get(tool.name)
+        if output_model is None and output_schema.get("type") == "object" and output_schema.get("properties"):
+            output_model = json_schema_to_model(f"{tool.name}_result", output_schema)
 
-            input_properties.append(Property(
-                name=name,
-                description=prop.get("description", ""),
-                title=prop.get("title", ""),
-                type=t if required else Optional[t]
-            ))
-
-        t = json_schema_types_to_python.get(prop.get("type"), None)
-        required = name in tool.inputSchema.get("required", [])
-        result: Property = Property(
-            name="result",
-            description=prop.get("description", "The result of the tool execution"),
-            title="Result",
-            type=t if required else Optional[t]
-        )
+        output = output_model or (json_schema_to_python(output_schema) if output_schema else str)
+        returns = output if output is str else Union[output, str]
 
         async def run(tool_context, *args, **kwargs):
             """Call MCP tool with the provided arguments and auth context."""
-            input = kwargs if len(args) == 0 else {prop.name: arg for prop, arg in zip(input_properties, args)}
-
-            # Extract auth context from tool_context (dict or object)
-            auth_ctx = tool_context.get("context") if isinstance(tool_context, dict) else getattr(tool_context, 'context', None)
-            headers = self._extract_auth_headers(auth_ctx)
+            try:
+                arguments = input_model.model_validate(dict(zip(input_model.model_fields, args)) | kwargs)
+            except ValidationError as e:
+                return f"Error calling tool '{tool.name}': {e}"
+            # Optional arguments the model left unset fall back to the tool's defaults
+            input = arguments.model_dump(exclude_none=True)
+
+            headers = tool_context_headers(tool_context)
             
             if not headers:
                 logger.warning(f"activity {tool.name} executing without auth headers")
             
-            async with MCPServerStreamableHttp(
-                params=MCPServerStreamableHttpParams(
-                    url=self.address,
-                    headers=headers
-                ),
-                use_structured_content=True
-            ) as conn:
-                return await conn.call_tool(tool.name, input)
+            with observe_tool(tool.name, "mcp"), trace_tool(tool.name, "mcp") as span:
+                # Sessions are shared so the trace context is sent in the request's _meta
+                # rather than its HTTP headers, which are fixed for the session
+                request = CallToolRequest(
+                    method="tools/call",
+                    params=CallToolRequestParams(name=tool.name, arguments=input, _meta=trace_context() or None),
+                )
+                async with self.sessions.session(headers) as conn:
+                    response = await conn.session.send_request(ClientRequest(request), CallToolResult)
 
-        setattr(run, "__name__", tool.name)
+                if response.isError:
+                    TOOL_ERRORS.labels(tool.name, "mcp").inc()
+                    span.set_status(Status(StatusCode.ERROR, "tool returned an error"))
 
-        sig = signature(run)
-        sig = sig.replace(
-            parameters=[
-                Parameter(name="tool_context", kind=Parameter.POSITIONAL_OR_KEYWORD, annotation=ToolContext),
-                *[Parameter(name=prop.name, kind=Parameter.POSITIONAL_OR_KEYWORD, annotation=prop.type) for prop in input_properties]
-            ],
-            return_annotation=result.type
-        )
-        setattr(run, "__signature__", sig)
+            # Errors, and tools without an output schema, only have text content
+            if response.isError or response.structuredContent is None:
+                return "\n".join(content.text for content in response.content if isinstance(content, TextContent))
 
-        args_doc = "\n".join([prop.docstring() for prop in input_properties])
-        setattr(run, "__doc__", f"""
-            {tool.description}
+            content = response.structuredContent.get("result") if wrapped else response.structuredContent
+            if output_model is not None:
+                return output_model.model_validate(content)
+            return content
 
-            Args:
-            {args_doc}
+        parameters = [Parameter(name="tool_context", kind=Parameter.POSITIONAL_OR_KEYWORD, annotation=ToolContext)]
+        for name, field in input_model.model_fields.items():
+            parameters.append(Parameter(
+                name=name,
+                kind=Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=field.annotation,
+                default=Parameter.empty if field.is_required() else None
+            ))
 
-            Returns:
-            {result.docstring()}
-        """)           
+        # Temporal takes argument types from the annotations and the agent from the signature
+        setattr(run, "__name__", tool.name)
+        setattr(run, "__signature__", Signature(parameters, return_annotation=returns))
+        setattr(run, "__annotations__", {
+            **{parameter.name: parameter.annotation for parameter in parameters},
+            "return": returns
+        })
+
+        args_doc = "\n".join(
+            f"    {name}: {field.description or ''}" for name, field in input_model.model_fields.items()
+        )
+        setattr(run, "__doc__", f"{tool.description or ''}\n\nArgs:\n{args_doc}\n")
 
         _Definition._apply_to_callable(run, activity_name=tool.name)
         return run
@@ -154,21 +281,95 @@ class MCPConfig(BaseSettings):
     async def init_tools(self):
         """
         init_tools caches the tools available on the MCP server. It must be called
-        prior to using the `activities` property.
+        prior to using the `activities` property and may be called again to pick up
+        changes to the tools, in which case only the activities of tools which have
+        changed are rebuilt.
         """
         async with MCPServerStreamableHttp(
             params=MCPServerStreamableHttpParams(url=self.address),
             use_structured_content=True
         ) as conn:
-            self._tools = await conn.list_tools()
+            tools = await conn.list_tools()
+
+        version = tool_catalog_version(tools)
+        if version == self._version:
+            return
+
+        definitions: Dict[str, tuple[MCPTool, Callable]] = {}
+        for tool in tools:
+            known = self._definitions.get(tool.name)
+            if known is not None and known[0] == tool:
+                definitions[tool.name] = known
+            else:
+                definitions[tool.name] = (tool, self._mcp_tool_to_activity(tool))
+
+        if self._version:
+            added = definitions.keys() - self._definitions.keys()
+            removed = self._definitions.keys() - definitions.keys()
+            changed = [name for name in definitions.keys() & self._definitions.keys() if definitions[name] is not self._definitions[name]]
+            logger.info(f"MCP tools changed to version {version}, added: {sorted(added)}, removed: {sorted(removed)}, changed: {sorted(changed)}")
+
+        self._tools = tools
+        self._definitions = definitions
+        self._activities = None
+        self._version = version
+
+    async def watch_tools(self, interval: float):
+        """
+        watch_tools checks the MCP server for changes to its tools every `interval`
+        seconds until cancelled. The server is polled as the agents SDK does not surface
+        its list_changed notifications.
+        """
+        if interval <= 0:
+            return
+
+        while True:
+            await sleep(interval)
+            try:
+                await self.init_tools()
+            except Exception as e:
+                logger.warning(f"failed to refresh MCP tools: {e}")
 
     @property
-    def activities(self):
+    def activities(self) -> List[Callable]:
         """
         activities returns a list of available tools as Temporal activities. `init_tools`
         must be called before accessing this property.
         """
-        return [self._mcp_tool_to_activity(tool) for tool in self._tools]
+        if self._activities is None:
+            self._activities = [activity for _, activity in self._definitions.values()]
+        return self._activities
+
+    @property
+    def catalog(self) -> ToolCatalog:
+        return ToolCatalog(
+            version=self._version,
+            tools=[tool.model_dump(mode="json") for tool in self._tools]
+        )
+
+    def activities_for(self, catalog: ToolCatalog) -> List[Callable]:
+        """
+        activities_for returns the activities of the given version of the tool catalog,
+        building them from the catalog's tool definitions if it is not the current one.
+        """
+        if catalog.version == self._version:
+            return self.activities
+
+        if catalog.version not in self._catalogs:
+            self._catalogs[catalog.version] = [
+                self._mcp_tool_to_activity(MCPTool.model_validate(tool)) for tool in catalog.tools
+            ]
+            while len(self._catalogs) > MAX_CATALOGS:
+                self._catalogs.popitem(last=False)
+        self._catalogs.move_to_end(catalog.version)
+        return self._catalogs[catalog.version]
+
+    @property
+    def read_only_tools(self) -> set[str]:
+        """
+        read_only_tools returns the names of the tools the MCP server marks as read-only.
+        """
+        return {tool.name for tool in self._tools if tool.annotations and tool.annotations.readOnlyHint}
 
 class OpenAIConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="openai_")
@@ -177,9 +378,20 @@ class OpenAIConfig(BaseSettings):
     api_base: str = "http://localhost:11434/v1"
     # model: str = "gpt-oss:20b"
     model: str = "llama3.2:3b"
+    # Approximate number of tokens of conversation history sent with each message. This
+    # is set per model according to its context window, falling back to the default.
+    history_tokens: dict[str, int] = {
+        "llama3.2:3b": 4_000,
+        "gpt-oss:20b": 16_000,
+    }
+    default_history_tokens: int = 8_000
 
     _client: AsyncOpenAI | None = None
 
+    @property
+    def history_budget(self) -> int:
+        return self.history_tokens.get(self.model, self.default_history_tokens)
+
     @property
     def client(self) -> AsyncOpenAI:
         if self._client is None:
@@ -190,6 +402,26 @@ class OpenAIConfig(BaseSettings):
         return self._client
 
 
+class ToolsConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="tools_")
+
+    # "mcp" calls tools through the MCP server whereas "grpc" calls the backend directly,
+    # which is faster but only possible where the worker can reach the backend
+    provider: Literal["mcp", "grpc"] = "mcp"
+    # Seconds between checks of the MCP server for changes to its tools, 0 disables them
+    refresh_interval: float = 60
+    # Seconds for which results of read-only tools are reused, 0 disables the cache
+    cache_ttl: float = 0
+    cache_size: int = 1024
+
+    _cache: ToolCache | None = None
+
+    @property
+    def cache(self) -> ToolCache:
+        if self._cache is None:
+            self._cache = ToolCache(ttl=self.cache_ttl, size=self.cache_size)
+        return self._cache
+
 class TemporalConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="temporal_")
 
@@ -224,20 +456,196 @@ class TemporalConfig(BaseSettings):
             domain=self.tls_domain,
         )
 
+class ConversationConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="conversation_")
+
+    # Number of messages a conversation holds while busy before rejecting more
+    max_pending: int = 10
+    # Seconds a conversation waits for further messages to answer along with the first
+    coalesce_seconds: float = 0
+
+class MetricsConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="metrics_")
+
+    # Port metrics are served on by processes which only run the worker, the API serves
+    # them on /metrics
+    port: int = 9464
+    # Address the Temporal SDK serves its own metrics on, unset to disable them. Only the
+    # worker's client serves them, so API processes never try to bind it.
+    temporal_address: Optional[str] = None
+
+    @property
+    def temporal_runtime(self) -> Runtime | None:
+        if self.temporal_address is None:
+            return None
+        return Runtime(telemetry=TelemetryConfig(metrics=PrometheusConfig(bind_address=self.temporal_address)))
+
+class StreamsConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="streams_")
+
+    # Redis the progress of responses is relayed through, required for it to reach
+    # requests served by a different process to the worker generating the response
+    redis_url: Optional[str] = None
+
+    _broker: StreamBroker | None = None
+
+    @property
+    def broker(self) -> StreamBroker:
+        if self._broker is None:
+            self._broker = StreamBroker() if self.redis_url is None else RedisStreamBroker(self.redis_url)
+        return self._broker
+
+class TracingConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="tracing_")
+
+    # Where spans are exported to if tracing has not been set up by auto-instrumentation.
+    # "otlp" is configured by the standard OTEL_EXPORTER_OTLP_* variables.
+    exporter: Literal["none", "otlp", "console", "file"] = "none"
+    file_path: str = "traces.jsonl"
+    service_name: str = "queue-service"
+
+    @property
+    def span_exporter(self) -> SpanExporter | None:
+        match self.exporter:
+            case "otlp":
+                return OTLPSpanExporter()
+            case "console":
+                return ConsoleSpanExporter()
+            case "file":
+                return ConsoleSpanExporter(
+                    out=open(self.file_path, "a"),
+                    formatter=lambda span: span.to_json(indent=None) + "\n",
+                )
+        return None
+
 class TemporalWorkerConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="worker_")
 
+    # Limits on the tasks a worker runs at once, unset to use Temporal's defaults
+    max_concurrent_workflow_tasks: Optional[int] = None
+    max_concurrent_activities: Optional[int] = None
+    max_concurrent_local_activities: Optional[int] = None
+    # Maximum number of concurrent polls for each kind of task, workflow task pollers
+    # must be at least 2
+    workflow_task_pollers: int = 5
+    activity_task_pollers: int = 5
+    # Seconds running activities are given to complete when the worker is stopped
+    graceful_shutdown_timeout: float = 10
+
+    @property
+    def workflow_task_poller_behavior(self) -> PollerBehaviorSimpleMaximum:
+        return PollerBehaviorSimpleMaximum(maximum=self.workflow_task_pollers)
+
+    @property
+    def activity_task_poller_behavior(self) -> PollerBehaviorSimpleMaximum:
+        return PollerBehaviorSimpleMaximum(maximum=self.activity_task_pollers)
+
 class Config(BaseModel):
     api: APIConfig = APIConfig()
     backend: BackendConfig = BackendConfig()
+    conversation: ConversationConfig = ConversationConfig()
     mcp: MCPConfig = MCPConfig()
+    metrics: MetricsConfig = MetricsConfig()
     openai: OpenAIConfig = OpenAIConfig()
+    streams: StreamsConfig = StreamsConfig()
     temporal: TemporalConfig = TemporalConfig()
+    tools: ToolsConfig = ToolsConfig()
+    tracing: TracingConfig = TracingConfig()
     worker: TemporalWorkerConfig = TemporalWorkerConfig()
 
+    _activities: List[Callable] | None = None
+    _activities_source: List[Callable] | None = None
+    _catalog_activity: Callable | None = None
+    _temporal_client: Client | None = None
+    _temporal_client_lock: Lock = PrivateAttr(default_factory=Lock)
+    _worker_temporal_client: Client | None = None
+
+    @property
+    def tool_provider(self) -> MCPConfig | BackendConfig:
+        """
+        tool_provider returns the config which supplies the agent's tools as activities,
+        as selected by `tools.provider`.
+        """
+        if self.tools.provider == "grpc":
+            return self.backend
+        return self.mcp
+
+    @property
+    def activities(self) -> List[Callable]:
+        """
+        activities returns the agent's tools as Temporal activities from the selected
+        provider, calling through the tool cache if it is enabled.
+        """
+        provider = self.tool_provider
+        if self.tools.cache_ttl <= 0:
+            return provider.activities
+
+        # Rewrapped whenever the provider's tools change
+        if self._activities_source is not provider.activities:
+            read_only = provider.read_only_tools
+            self._activities = [self.tools.cache.wrap(activity, read_only=activity.__name__ in read_only) for activity in provider.activities]
+            self._activities_source = provider.activities
+        return self._activities
+
+    @property
+    def catalog_activity(self) -> Callable:
+        """
+        catalog_activity returns the activity through which conversations learn which
+        version of the tool catalog to use.
+        """
+        if self._catalog_activity is None:
+            self._catalog_activity = tool_catalog_activity(lambda: self.tool_provider.catalog)
+        return self._catalog_activity
+
+    @property
+    def worker_activities(self) -> List[Callable]:
+        """
+        worker_activities returns the activities to register with the worker. MCP tools
+        are handled by a single dynamic activity which calls their current definitions,
+        so that changes to the tools do not require the worker to be restarted.
+        """
+        if self.tools.provider == "mcp":
+            return [self.catalog_activity, dynamic_tool_activity(self._resolve_tool)]
+        return [self.catalog_activity, *self.activities]
+
+    def _resolve_tool(self, name: str) -> Optional[Callable]:
+        return next((activity for activity in self.activities if activity.__name__ == name), None)
+
     @property
     def temporal_client(self) -> Coroutine[Any, Any, Client]:
-        return Client.connect(
+        """
+        temporal_client returns the Temporal client used by the API. It connects on first
+        use, and again on the next use if connecting fails.
+        """
+        return self._get_temporal_client()
+
+    async def _get_temporal_client(self) -> Client:
+        if self._temporal_client is not None:
+            return self._temporal_client
+
+        async with self._temporal_client_lock:
+            # Another caller may have connected while this one was waiting
+            if self._temporal_client is None:
+                self._temporal_client = await self._connect_temporal()
+            return self._temporal_client
+
+    async def worker_temporal_client(self) -> Client:
+        """
+        worker_temporal_client returns the Temporal client the worker runs on. It is the
+        API's client unless `metrics.temporal_address` is set, in which case it has its own
+        runtime serving the SDK's metrics, so that only the worker binds that address.
+        """
+        runtime = self.metrics.temporal_runtime
+        if runtime is None:
+            return await self._get_temporal_client()
+
+        if self._worker_temporal_client is None:
+            self._worker_temporal_client = await self._connect_temporal(runtime)
+        return self._worker_temporal_client
+
+    async def _connect_temporal(self, runtime: Runtime | None = None) -> Client:
+        logger.info("connecting to Temporal...")
+        return await Client.connect(
             f"{self.temporal.host}:{self.temporal.port}",
             namespace=self.temporal.namespace,
             tls=self.temporal.tls_config,
@@ -251,10 +659,12 @@ class Config(BaseModel):
                         initial_interval=timedelta(seconds=1),
                     )
                 ),
-                model_provider=OpenAIProvider(
+                # Streams responses to any requests waiting on them
+                model_provider=StreamingModelProvider(OpenAIProvider(
                     api_key=self.openai.api_key,
                     base_url=self.openai.api_base
-                )
+                ), broker=self.streams.broker)
             )],
             interceptors=[TracingInterceptor()],
+            runtime=runtime,
         ) 
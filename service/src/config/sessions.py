@@ -0,0 +1,185 @@
+from asyncio import Event, Future, Task, CancelledError, create_task, gather, get_running_loop, shield, sleep, wait_for
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import AsyncIterator, Optional
+
+from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams
+from loguru import logger
+
+# Sessions are keyed by the sorted auth headers they were opened with
+Key = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Session:
+    server: MCPServerStreamableHttp
+    ready: Future
+    closing: Event = field(default_factory=Event)
+    last_used: float = field(default_factory=monotonic)
+    in_flight: int = 0
+    evicted: bool = False
+
+
+class SessionPool:
+    """
+    SessionPool holds long-lived MCP sessions keyed by the auth headers they were opened
+    with, so a tool call is a single request on an already initialised session. Headers
+    are fixed for the lifetime of a streamable HTTP connection, hence one session per
+    identity rather than per-call headers.
+
+    Each session is owned by a dedicated task as the transport must be closed by the
+    task that opened it. Sessions that have not been used for `health_check_interval`
+    are pinged before being reused, those idle for longer than `idle_timeout` are closed
+    by a reaper task and, beyond `max_sessions`, the least recently used are closed.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        idle_timeout: float,
+        health_check_interval: float,
+        health_check_timeout: float,
+        max_sessions: int,
+    ):
+        self._address = address
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._health_check_timeout = health_check_timeout
+        self._max_sessions = max(max_sessions, 1)
+        self._sessions: OrderedDict[Key, _Session] = OrderedDict()
+        self._owners: set[Task] = set()
+        self._reaper: Optional[Task] = None
+        self._closed = False
+
+    @asynccontextmanager
+    async def session(self, headers: dict[str, str]) -> AsyncIterator[MCPServerStreamableHttp]:
+        """
+        session yields a connected MCP server for the given auth headers, opening one if
+        necessary. It must be used from within a single event loop.
+        """
+        if self._closed:
+            raise RuntimeError("session pool is closed")
+
+        key: Key = tuple(sorted(headers.items()))
+        session = await self._acquire(key, headers)
+        try:
+            yield session.server
+        except Exception:
+            # Tool errors are returned in the result, so an exception means the
+            # session may be broken and is not reused
+            self._release(key, session, evict=True)
+            raise
+        except BaseException:
+            self._release(key, session)
+            raise
+        else:
+            self._release(key, session)
+
+    async def _acquire(self, key: Key, headers: dict[str, str]) -> _Session:
+        # A stale session is replaced once, a fresh one failing to connect is not retried
+        for attempt in range(2):
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._open(key, headers)
+            self._sessions.move_to_end(key)
+            session.in_flight += 1
+
+            try:
+                # Shielded as the connection attempt may be shared with other callers
+                await shield(session.ready)
+                if session.in_flight == 1 and monotonic() - session.last_used > self._health_check_interval:
+                    await wait_for(session.server.session.send_ping(), timeout=self._health_check_timeout)
+                return session
+            except Exception as e:
+                self._release(key, session, evict=True)
+                if attempt > 0:
+                    raise
+                logger.warning(f"replacing MCP session: {e}")
+            except BaseException:
+                self._release(key, session)
+                raise
+
+        raise RuntimeError("unreachable")
+
+    def _release(self, key: Key, session: _Session, evict: bool = False):
+        session.in_flight -= 1
+        session.last_used = monotonic()
+        if evict or session.evicted:
+            self._evict(key, session)
+
+    def _open(self, key: Key, headers: dict[str, str]) -> _Session:
+        session = _Session(
+            server=MCPServerStreamableHttp(
+                params=MCPServerStreamableHttpParams(
+                    url=self._address,
+                    headers=headers
+                ),
+                use_structured_content=True
+            ),
+            ready=get_running_loop().create_future(),
+        )
+        self._sessions[key] = session
+
+        owner = create_task(self._own(session))
+        self._owners.add(owner)
+        owner.add_done_callback(self._owners.discard)
+
+        while len(self._sessions) > self._max_sessions:
+            self._evict(*next(iter(self._sessions.items())))
+
+        if self._reaper is None:
+            self._reaper = create_task(self._reap())
+
+        return session
+
+    def _evict(self, key: Key, session: _Session):
+        # The key may already have been taken by a replacement session
+        if self._sessions.get(key) is session:
+            del self._sessions[key]
+
+        session.evicted = True
+        if session.in_flight == 0:
+            session.closing.set()
+
+    async def _own(self, session: _Session):
+        try:
+            await session.server.connect()
+        except Exception as e:
+            session.ready.set_exception(e)
+            return
+
+        session.ready.set_result(None)
+        try:
+            await session.closing.wait()
+        finally:
+            await session.server.cleanup()
+
+    async def _reap(self):
+        interval = max(self._idle_timeout / 2, 1.0)
+        while True:
+            await sleep(interval)
+            now = monotonic()
+            for key, session in list(self._sessions.items()):
+                if session.in_flight == 0 and now - session.last_used > self._idle_timeout:
+                    logger.debug("closing idle MCP session")
+                    self._evict(key, session)
+
+    async def close(self):
+        """
+        close closes every session once its in-flight calls have completed. The pool
+        cannot be used afterwards.
+        """
+        self._closed = True
+
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except CancelledError:
+                pass
+
+        for key, session in list(self._sessions.items()):
+            self._evict(key, session)
+        await gather(*self._owners)
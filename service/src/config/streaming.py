@@ -0,0 +1,91 @@
+from time import perf_counter
+from typing import Any, AsyncIterator
+
+from agents import Model, ModelProvider, ModelResponse, Usage
+from agents.items import TResponseStreamEvent
+from openai.types.responses import ResponseCompletedEvent, ResponseOutputItemDoneEvent, ResponseTextDeltaEvent
+from temporalio import activity
+
+from ..metrics import MODEL_LATENCY, MODEL_TOKENS
+from ..schema import StreamEvent
+from ..tracing import tracer
+from ..streams import StreamBroker
+
+
+class StreamingModel(Model):
+    """
+    StreamingModel wraps a model so that, when it is invoked by the model activity of a
+    conversation that has requests waiting on it, the response is streamed and its
+    progress published to the broker. The workflow still receives the complete response
+    as Temporal does not support streaming into workflows. The latency and token usage
+    of every call are recorded, and a span is recorded for it.
+    """
+
+    def __init__(self, model: Model, name: str, broker: StreamBroker):
+        self._model = model
+        self._name = name
+        self._broker = broker
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        start = perf_counter()
+        streamed = False
+        with tracer.start_as_current_span(f"model {self._name}", attributes={"gen_ai.request.model": self._name}) as span:
+            try:
+                key = activity.info().workflow_id if activity.in_activity() else None
+                streamed = key is not None and await self._broker.has_subscribers(key)
+                span.set_attribute("streamed", streamed)
+                if streamed:
+                    response = await self._stream(key, *args, **kwargs)
+                else:
+                    response = await self._model.get_response(*args, **kwargs)
+            finally:
+                MODEL_LATENCY.labels(self._name, str(streamed).lower()).observe(perf_counter() - start)
+
+            span.set_attribute("gen_ai.usage.input_tokens", response.usage.input_tokens)
+            span.set_attribute("gen_ai.usage.output_tokens", response.usage.output_tokens)
+
+        MODEL_TOKENS.labels(self._name, "input").inc(response.usage.input_tokens)
+        MODEL_TOKENS.labels(self._name, "output").inc(response.usage.output_tokens)
+        return response
+
+    async def _stream(self, key: str, *args: Any, **kwargs: Any) -> ModelResponse:
+        response: ModelResponse | None = None
+        async for event in self._model.stream_response(*args, **kwargs):
+            if isinstance(event, ResponseTextDeltaEvent):
+                await self._broker.publish(key, StreamEvent(type="delta", text=event.delta))
+            elif isinstance(event, ResponseOutputItemDoneEvent) and event.item.type == "function_call":
+                await self._broker.publish(key, StreamEvent(type="tool_call", name=event.item.name))
+            elif isinstance(event, ResponseCompletedEvent):
+                usage = event.response.usage
+                response = ModelResponse(
+                    output=event.response.output,
+                    usage=Usage(
+                        requests=1,
+                        input_tokens=usage.input_tokens,
+                        output_tokens=usage.output_tokens,
+                        total_tokens=usage.total_tokens,
+                        input_tokens_details=usage.input_tokens_details,
+                        output_tokens_details=usage.output_tokens_details,
+                    ) if usage else Usage(),
+                    response_id=event.response.id,
+                )
+
+        if response is None:
+            raise RuntimeError("model stream ended without a completed response")
+        return response
+
+    def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        return self._model.stream_response(*args, **kwargs)
+
+
+class StreamingModelProvider(ModelProvider):
+    """
+    StreamingModelProvider provides the models of the wrapped provider as `StreamingModel`s.
+    """
+
+    def __init__(self, provider: ModelProvider, broker: StreamBroker):
+        self._provider = provider
+        self._broker = broker
+
+    def get_model(self, model_name: str | None) -> Model:
+        return StreamingModel(self._provider.get_model(model_name), name=model_name or "default", broker=self._broker)
@@ -0,0 +1,264 @@
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence
+
+from agents.tool_context import ToolContext
+from grpc import RpcError, StatusCode
+from loguru import logger
+from temporalio import activity
+from temporalio.activity import _Definition
+from temporalio.common import RawValue
+
+from ..gen.queue_service_pb2 import (
+    GetQueueRequest,
+    GetQueueResponse,
+    GetPositionRequest,
+    GetPositionResponse,
+    AddEntityRequest,
+    AddEntityResponse,
+    RemoveEntityRequest,
+    RemoveEntityResponse,
+    Entity,
+)
+from ..metrics import TOOL_ERRORS, observe_tool
+from ..tracing import mark_error, trace_context, trace_tool
+from ..schema.tools import QueueEntity, QueuePage, QueuePosition, EntityAdded, EntityRemoved, ToolCatalog
+
+if TYPE_CHECKING:
+    from .config import BackendConfig
+
+# Bounds on how much of a queue is returned by a single get_queue call, matching the MCP server
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def extract_auth_headers(auth_ctx: Any) -> dict[str, str]:
+    """Extract auth headers from AuthContext (dict or object)."""
+    headers = {}
+    if not auth_ctx:
+        return headers
+
+    # Handle both dict and object attribute access
+    get_attr = auth_ctx.get if isinstance(auth_ctx, dict) else lambda k: getattr(auth_ctx, k, None)
+
+    if user := get_attr('auth_user'):
+        headers['X-Auth-Request-User'] = user
+    if email := get_attr('auth_email'):
+        headers['X-Auth-Request-Email'] = email
+    if groups := get_attr('auth_groups'):
+        headers['X-Auth-Request-Groups'] = groups
+
+    return headers
+
+
+def tool_context_headers(tool_context: Any) -> dict[str, str]:
+    """
+    tool_context_headers returns the auth headers carried by a tool call's context, which
+    arrives as a dict once it has been passed to an activity.
+    """
+    auth_ctx = tool_context.get("context") if isinstance(tool_context, dict) else getattr(tool_context, 'context', None)
+    return extract_auth_headers(auth_ctx)
+
+
+def backend_activities(backend: "BackendConfig") -> List[Callable]:
+    """
+    backend_activities returns Temporal activities which implement the same tools as the
+    MCP server by calling the backend directly. This saves the hop through the MCP server
+    but requires the worker to be able to reach the backend.
+
+    Results are the same models the MCP tools' structured results are deserialised into.
+    As with the MCP server, failed calls are reported to the agent in the tool result
+    rather than failing the run, except where the backend is unavailable in which case
+    the activity is retried.
+    """
+
+    def metadata(tool_context: Any) -> tuple[tuple[str, str], ...]:
+        headers = tool_context_headers(tool_context)
+        if not headers:
+            logger.warning(f"activity {activity.info().activity_type} executing without auth headers")
+        # gRPC metadata keys must be lowercase
+        return tuple((key.lower(), value) for key, value in (headers | trace_context()).items())
+
+    def error(tool: str, e: RpcError) -> str:
+        if e.code() == StatusCode.UNAVAILABLE:
+            raise e
+        TOOL_ERRORS.labels(tool, "grpc").inc()
+        mark_error(e.details())
+        return f"Error calling tool '{tool}': {e.details()}"
+
+    @activity.defn(name="get_queue")
+    async def get_queue(
+        tool_context: ToolContext,
+        queue_id: str,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> QueuePage | str:
+        """
+        get_queue retrieves the specified queue. The response includes entity IDs and names.
+        Long queues are returned a page at a time, pass next_offset as offset to read further.
+        To find where a single entity is in the queue, use get_position instead.
+
+        Args:
+            queue_id: The ID of the queue
+            offset: The position, starting at 0, of the first entity to return
+            limit: The maximum number of entities to return, at most 200
+        """
+        first = max(offset or 0, 0)
+
+        with observe_tool("get_queue", "grpc"), trace_tool("get_queue", "grpc"):
+            try:
+                response: GetQueueResponse = await backend.stub.GetQueue(
+                    GetQueueRequest(
+                        id=queue_id,
+                        offset=first,
+                        page_size=min(max(limit or DEFAULT_LIMIT, 1), MAX_LIMIT)
+                    ),
+                    metadata=metadata(tool_context),
+                    timeout=backend.timeout
+                )
+            except RpcError as e:
+                logger.error("failed to get queue: " + str(e))
+                return error("get_queue", e)
+
+        return QueuePage(
+            entities=[QueueEntity(id=entity.id, name=entity.name) for entity in response.entities],
+            offset=first,
+            total=response.total_size,
+            next_offset=first + len(response.entities) if response.next_page_token else None
+        )
+
+    @activity.defn(name="get_position")
+    async def get_position(tool_context: ToolContext, queue_id: str, entity_id: str) -> QueuePosition | str:
+        """
+        get_position finds where an entity is in the specified queue without retrieving the
+        rest of the queue. Positions start at 1 for the front of the queue.
+
+        Args:
+            queue_id: The ID of the queue
+            entity_id: The ID of the entity to locate
+        """
+        with observe_tool("get_position", "grpc"), trace_tool("get_position", "grpc"):
+            try:
+                response: GetPositionResponse = await backend.stub.GetPosition(
+                    GetPositionRequest(
+                        id=queue_id,
+                        entity_id=entity_id
+                    ),
+                    metadata=metadata(tool_context),
+                    timeout=backend.timeout
+                )
+            except RpcError as e:
+                logger.error("failed to get position: " + str(e))
+                return error("get_position", e)
+
+        if not response.HasField("entity"):
+            return QueuePosition(entity_id=entity_id, found=False, length=response.length)
+
+        return QueuePosition(
+            entity_id=entity_id,
+            found=True,
+            name=response.entity.name,
+            position=response.position + 1,
+            length=response.length
+        )
+
+    @activity.defn(name="add_to_queue")
+    async def add_to_queue(tool_context: ToolContext, queue_id: str, entity_id: str, entity_name: str) -> EntityAdded | str:
+        """
+        add_to_queue adds an entity to the specified queue. A valid entity_id is required.
+
+        Args:
+            queue_id: The ID of the queue
+            entity_id: The ID of the entity to add to the queue. Must be a valid, non-empty identifier.
+            entity_name: The name of the entity to add to the queue
+        """
+        if not entity_id or entity_id.strip() == "":
+            TOOL_ERRORS.labels("add_to_queue", "grpc").inc()
+            return "Error calling tool 'add_to_queue': entity_id is required and cannot be empty. Please provide a valid identifier for the entity."
+
+        with observe_tool("add_to_queue", "grpc"), trace_tool("add_to_queue", "grpc"):
+            try:
+                response: AddEntityResponse = await backend.stub.AddEntity(
+                    AddEntityRequest(
+                        id=queue_id,
+                        entity=Entity(
+                            id=entity_id,
+                            name=entity_name
+                        )
+                    ),
+                    metadata=metadata(tool_context),
+                    timeout=backend.timeout
+                )
+            except RpcError as e:
+                logger.error("failed to add entity: " + str(e))
+                return error("add_to_queue", e)
+
+        return EntityAdded(
+            entity_id=entity_id,
+            name=entity_name,
+            position=response.position + 1
+        )
+
+    @activity.defn(name="remove_from_queue")
+    async def remove_from_queue(tool_context: ToolContext, queue_id: str, entity_id: str) -> EntityRemoved | str:
+        """
+        remove_from_queue removes an entity from the specified queue
+
+        Args:
+            queue_id: The ID of the queue
+            entity_id: The ID of the entity to remove from the queue
+        """
+        with observe_tool("remove_from_queue", "grpc"), trace_tool("remove_from_queue", "grpc"):
+            try:
+                response: RemoveEntityResponse = await backend.stub.RemoveEntity(
+                    RemoveEntityRequest(
+                        id=queue_id,
+                        entity_id=entity_id
+                    ),
+                    metadata=metadata(tool_context),
+                    timeout=backend.timeout
+                )
+            except RpcError as e:
+                logger.error("failed to remove entity: " + str(e))
+                return error("remove_from_queue", e)
+
+        return EntityRemoved(entity_id=entity_id, removed=response.removed)
+
+    return [get_queue, get_position, add_to_queue, remove_from_queue]
+
+
+def tool_catalog_activity(catalog: Callable[[], ToolCatalog]) -> Callable:
+    """
+    tool_catalog_activity returns an activity which reports the current tool catalog. It
+    is run as a local activity each turn so the tools a turn was run with are recorded in
+    the workflow's history.
+    """
+
+    @activity.defn(name="get_tool_catalog")
+    async def get_tool_catalog() -> ToolCatalog:
+        return catalog()
+
+    return get_tool_catalog
+
+
+def dynamic_tool_activity(resolve: Callable[[str], Optional[Callable]]) -> Callable:
+    """
+    dynamic_tool_activity returns a dynamic activity which handles a call to any tool by
+    calling the current definition of the tool named by the activity type. This allows
+    tools to be added or changed without registering activities with the worker again.
+    """
+
+    @activity.defn(dynamic=True)
+    async def call_tool(args: Sequence[RawValue]) -> Any:
+        name = activity.info().activity_type
+        fn = resolve(name)
+        if fn is None:
+            logger.warning(f"activity {name} called for an unknown tool")
+            return f"Error calling tool '{name}': the tool is no longer available"
+
+        # Arguments are decoded with the types of the tool's current definition
+        values = activity.payload_converter().from_payloads(
+            [arg.payload for arg in args],
+            _Definition.must_from_callable(fn).arg_types,
+        )
+        return await fn(*values)
+
+    return call_tool
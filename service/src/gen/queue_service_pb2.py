@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.api import annotations_pb2 as google_dot_api_dot_annotations__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bsrc/gen/queue_service.proto\x12\x05queue\x1a\x1cgoogle/api/annotations.proto\"\"\n\x06\x45ntity\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\x1d\n\x0fGetQueueRequest\x12\n\n\x02id\x18\x01 \x01(\t\"3\n\x10GetQueueResponse\x12\x1f\n\x08\x65ntities\x18\x01 \x03(\x0b\x32\r.queue.Entity\">\n\x0fSetQueueRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1f\n\x08\x65ntities\x18\x02 \x03(\x0b\x32\r.queue.Entity\"\x12\n\x10SetQueueResponse2\xae\x01\n\x05Queue\x12P\n\x08GetQueue\x12\x16.queue.GetQueueRequest\x1a\x17.queue.GetQueueResponse\"\x13\x82\xd3\xe4\x93\x02\r\x12\x0b/queue/{id}\x12S\n\x08SetQueue\x12\x16.queue.SetQueueRequest\x1a\x17.queue.SetQueueResponse\"\x16\x82\xd3\xe4\x93\x02\x10\x1a\x0b/queue/{id}:\x01*B(Z&github.com/abayleypublic/queue/gatewayb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bsrc/gen/queue_service.proto\x12\x05queue\x1a\x1cgoogle/api/annotations.proto\"\"\n\x06\x45ntity\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"T\n\x0fGetQueueRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\t\x12\x0e\n\x06offset\x18\x04 \x01(\x03\"q\n\x10GetQueueResponse\x12\x1f\n\x08\x65ntities\x18\x01 \x03(\x0b\x32\r.queue.Entity\x12\x0f\n\x07version\x18\x02 \x01(\x04\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\t\x12\x12\n\ntotal_size\x18\x04 \x01(\x03\"4\n\x12StreamQueueRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nbatch_size\x18\x02 \x01(\x05\"W\n\x13StreamQueueResponse\x12\x1f\n\x08\x65ntities\x18\x01 \x03(\x0b\x32\r.queue.Entity\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0f\n\x07version\x18\x03 \x01(\x04\"3\n\x12GetPositionRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tentity_id\x18\x02 \x01(\t\"g\n\x13GetPositionResponse\x12\x1d\n\x06\x65ntity\x18\x01 \x01(\x0b\x32\r.queue.Entity\x12\x10\n\x08position\x18\x02 \x01(\x03\x12\x0e\n\x06length\x18\x03 \x01(\x03\x12\x0f\n\x07version\x18\x04 \x01(\x04\"/\n\x1aListQueuesForEntityRequest\x12\x11\n\tentity_id\x18\x01 \x01(\t\"0\n\x1bListQueuesForEntityResponse\x12\x11\n\tqueue_ids\x18\x01 \x03(\t\"r\n\x0fSetQueueRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1f\n\x08\x65ntities\x18\x02 \x03(\x0b\x32\r.queue.Entity\x12\x1d\n\x10\x65xpected_version\x18\x03 \x01(\x04H\x00\x88\x01\x01\x42\x13\n\x11_expected_version\"#\n\x10SetQueueResponse\x12\x0f\n\x07version\x18\x01 \x01(\x04\"=\n\x10\x41\x64\x64\x45ntityRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1d\n\x06\x65ntity\x18\x02 \x01(\x0b\x32\r.queue.Entity\"6\n\x11\x41\x64\x64\x45ntityResponse\x12\x10\n\x08position\x18\x01 \x01(\x03\x12\x0f\n\x07version\x18\x02 \x01(\x04\"4\n\x13RemoveEntityRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\tentity_id\x18\x02 \x01(\t\"8\n\x14RemoveEntityResponse\x12\x0f\n\x07removed\x18\x01 \x01(\x08\x12\x0f\n\x07version\x18\x02 \x01(\x04\"!\n\x0c\x45ntityFilter\x12\x11\n\tentity_id\x18\x01 \x01(\t\"M\n\x1aRemoveEntitiesWhereRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12#\n\x06\x66ilter\x18\x02 \x01(\x0b\x32\x13.queue.EntityFilter\"?\n\x1bRemoveEntitiesWhereResponse\x12\x0f\n\x07removed\x18\x01 \x01(\x03\x12\x0f\n\x07version\x18\x02 \x01(\x04\x32\xf5\x06\n\x05Queue\x12P\n\x08GetQueue\x12\x16.queue.GetQueueRequest\x1a\x17.queue.GetQueueResponse\"\x13\x82\xd3\xe4\x93\x02\r\x12\x0b/queue/{id}\x12\x62\n\x0bStreamQueue\x12\x19.queue.StreamQueueRequest\x1a\x1a.queue.StreamQueueResponse\"\x1a\x82\xd3\xe4\x93\x02\x14\x12\x12/queue/{id}:stream0\x01\x12w\n\x0bGetPosition\x12\x19.queue.GetPositionRequest\x1a\x1a.queue.GetPositionResponse\"1\x82\xd3\xe4\x93\x02+\x12)/queue/{id}/entities/{entity_id}/position\x12\x82\x01\n\x13ListQueuesForEntity\x12!.queue.ListQueuesForEntityRequest\x1a\".queue.ListQueuesForEntityResponse\"$\x82\xd3\xe4\x93\x02\x1e\x12\x1c/entities/{entity_id}/queues\x12S\n\x08SetQueue\x12\x16.queue.SetQueueRequest\x1a\x17.queue.SetQueueResponse\"\x16\x82\xd3\xe4\x93\x02\x10\x1a\x0b/queue/{id}:\x01*\x12\x64\n\tAddEntity\x12\x17.queue.AddEntityRequest\x1a\x18.queue.AddEntityResponse\"$\x82\xd3\xe4\x93\x02\x1e\"\x14/queue/{id}/entities:\x06\x65ntity\x12q\n\x0cRemoveEntity\x12\x1a.queue.RemoveEntityRequest\x1a\x1b.queue.RemoveEntityResponse\"(\x82\xd3\xe4\x93\x02\"* /queue/{id}/entities/{entity_id}\x12\x89\x01\n\x13RemoveEntitiesWhere\x12!.queue.RemoveEntitiesWhereRequest\x1a\".queue.RemoveEntitiesWhereResponse\"+\x82\xd3\xe4\x93\x02%\" /queue/{id}/entities:removeWhere:\x01*B(Z&github.com/abayleypublic/queue/gatewayb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,18 +35,56 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._serialized_options = b'Z&github.com/abayleypublic/queue/gateway'
   _globals['_QUEUE'].methods_by_name['GetQueue']._loaded_options = None
   _globals['_QUEUE'].methods_by_name['GetQueue']._serialized_options = b'\202\323\344\223\002\r\022\013/queue/{id}'
+  _globals['_QUEUE'].methods_by_name['StreamQueue']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['StreamQueue']._serialized_options = b'\202\323\344\223\002\024\022\022/queue/{id}:stream'
+  _globals['_QUEUE'].methods_by_name['GetPosition']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['GetPosition']._serialized_options = b'\202\323\344\223\002+\022)/queue/{id}/entities/{entity_id}/position'
+  _globals['_QUEUE'].methods_by_name['ListQueuesForEntity']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['ListQueuesForEntity']._serialized_options = b'\202\323\344\223\002\036\022\034/entities/{entity_id}/queues'
   _globals['_QUEUE'].methods_by_name['SetQueue']._loaded_options = None
   _globals['_QUEUE'].methods_by_name['SetQueue']._serialized_options = b'\202\323\344\223\002\020\032\013/queue/{id}:\001*'
+  _globals['_QUEUE'].methods_by_name['AddEntity']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['AddEntity']._serialized_options = b'\202\323\344\223\002\036\"\024/queue/{id}/entities:\006entity'
+  _globals['_QUEUE'].methods_by_name['RemoveEntity']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['RemoveEntity']._serialized_options = b'\202\323\344\223\002\"* /queue/{id}/entities/{entity_id}'
+  _globals['_QUEUE'].methods_by_name['RemoveEntitiesWhere']._loaded_options = None
+  _globals['_QUEUE'].methods_by_name['RemoveEntitiesWhere']._serialized_options = b'\202\323\344\223\002%\" /queue/{id}/entities:removeWhere:\001*'
   _globals['_ENTITY']._serialized_start=68
   _globals['_ENTITY']._serialized_end=102
   _globals['_GETQUEUEREQUEST']._serialized_start=104
-  _globals['_GETQUEUEREQUEST']._serialized_end=133
-  _globals['_GETQUEUERESPONSE']._serialized_start=135
-  _globals['_GETQUEUERESPONSE']._serialized_end=186
-  _globals['_SETQUEUEREQUEST']._serialized_start=188
-  _globals['_SETQUEUEREQUEST']._serialized_end=250
-  _globals['_SETQUEUERESPONSE']._serialized_start=252
-  _globals['_SETQUEUERESPONSE']._serialized_end=270
-  _globals['_QUEUE']._serialized_start=273
-  _globals['_QUEUE']._serialized_end=447
+  _globals['_GETQUEUEREQUEST']._serialized_end=188
+  _globals['_GETQUEUERESPONSE']._serialized_start=190
+  _globals['_GETQUEUERESPONSE']._serialized_end=303
+  _globals['_STREAMQUEUEREQUEST']._serialized_start=305
+  _globals['_STREAMQUEUEREQUEST']._serialized_end=357
+  _globals['_STREAMQUEUERESPONSE']._serialized_start=359
+  _globals['_STREAMQUEUERESPONSE']._serialized_end=446
+  _globals['_GETPOSITIONREQUEST']._serialized_start=448
+  _globals['_GETPOSITIONREQUEST']._serialized_end=499
+  _globals['_GETPOSITIONRESPONSE']._serialized_start=501
+  _globals['_GETPOSITIONRESPONSE']._serialized_end=604
+  _globals['_LISTQUEUESFORENTITYREQUEST']._serialized_start=606
+  _globals['_LISTQUEUESFORENTITYREQUEST']._serialized_end=653
+  _globals['_LISTQUEUESFORENTITYRESPONSE']._serialized_start=655
+  _globals['_LISTQUEUESFORENTITYRESPONSE']._serialized_end=703
+  _globals['_SETQUEUEREQUEST']._serialized_start=705
+  _globals['_SETQUEUEREQUEST']._serialized_end=819
+  _globals['_SETQUEUERESPONSE']._serialized_start=821
+  _globals['_SETQUEUERESPONSE']._serialized_end=856
+  _globals['_ADDENTITYREQUEST']._serialized_start=858
+  _globals['_ADDENTITYREQUEST']._serialized_end=919
+  _globals['_ADDENTITYRESPONSE']._serialized_start=921
+  _globals['_ADDENTITYRESPONSE']._serialized_end=975
+  _globals['_REMOVEENTITYREQUEST']._serialized_start=977
+  _globals['_REMOVEENTITYREQUEST']._serialized_end=1029
+  _globals['_REMOVEENTITYRESPONSE']._serialized_start=1031
+  _globals['_REMOVEENTITYRESPONSE']._serialized_end=1087
+  _globals['_ENTITYFILTER']._serialized_start=1089
+  _globals['_ENTITYFILTER']._serialized_end=1122
+  _globals['_REMOVEENTITIESWHEREREQUEST']._serialized_start=1124
+  _globals['_REMOVEENTITIESWHEREREQUEST']._serialized_end=1201
+  _globals['_REMOVEENTITIESWHERERESPONSE']._serialized_start=1203
+  _globals['_REMOVEENTITIESWHERERESPONSE']._serialized_end=1266
+  _globals['_QUEUE']._serialized_start=1269
+  _globals['_QUEUE']._serialized_end=2154
 # @@protoc_insertion_point(module_scope)
@@ -39,11 +39,41 @@ class QueueStub(object):
                 request_serializer=src_dot_gen_dot_queue__service__pb2.GetQueueRequest.SerializeToString,
                 response_deserializer=src_dot_gen_dot_queue__service__pb2.GetQueueResponse.FromString,
                 _registered_method=True)
+        self.StreamQueue = channel.unary_stream(
+                '/queue.Queue/StreamQueue',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.StreamQueueRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.StreamQueueResponse.FromString,
+                _registered_method=True)
+        self.GetPosition = channel.unary_unary(
+                '/queue.Queue/GetPosition',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.GetPositionRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.GetPositionResponse.FromString,
+                _registered_method=True)
+        self.ListQueuesForEntity = channel.unary_unary(
+                '/queue.Queue/ListQueuesForEntity',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityResponse.FromString,
+                _registered_method=True)
         self.SetQueue = channel.unary_unary(
                 '/queue.Queue/SetQueue',
                 request_serializer=src_dot_gen_dot_queue__service__pb2.SetQueueRequest.SerializeToString,
                 response_deserializer=src_dot_gen_dot_queue__service__pb2.SetQueueResponse.FromString,
                 _registered_method=True)
+        self.AddEntity = channel.unary_unary(
+                '/queue.Queue/AddEntity',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.AddEntityRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.AddEntityResponse.FromString,
+                _registered_method=True)
+        self.RemoveEntity = channel.unary_unary(
+                '/queue.Queue/RemoveEntity',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.RemoveEntityRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.RemoveEntityResponse.FromString,
+                _registered_method=True)
+        self.RemoveEntitiesWhere = channel.unary_unary(
+                '/queue.Queue/RemoveEntitiesWhere',
+                request_serializer=src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereRequest.SerializeToString,
+                response_deserializer=src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereResponse.FromString,
+                _registered_method=True)
 
 
 class QueueServicer(object):
@@ -55,12 +85,48 @@ class QueueServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamQueue(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPosition(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListQueuesForEntity(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SetQueue(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AddEntity(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveEntity(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveEntitiesWhere(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_QueueServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -69,11 +135,41 @@ def add_QueueServicer_to_server(servicer, server):
                     request_deserializer=src_dot_gen_dot_queue__service__pb2.GetQueueRequest.FromString,
                     response_serializer=src_dot_gen_dot_queue__service__pb2.GetQueueResponse.SerializeToString,
             ),
+            'StreamQueue': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamQueue,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.StreamQueueRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.StreamQueueResponse.SerializeToString,
+            ),
+            'GetPosition': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPosition,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.GetPositionRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.GetPositionResponse.SerializeToString,
+            ),
+            'ListQueuesForEntity': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListQueuesForEntity,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityResponse.SerializeToString,
+            ),
             'SetQueue': grpc.unary_unary_rpc_method_handler(
                     servicer.SetQueue,
                     request_deserializer=src_dot_gen_dot_queue__service__pb2.SetQueueRequest.FromString,
                     response_serializer=src_dot_gen_dot_queue__service__pb2.SetQueueResponse.SerializeToString,
             ),
+            'AddEntity': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddEntity,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.AddEntityRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.AddEntityResponse.SerializeToString,
+            ),
+            'RemoveEntity': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveEntity,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.RemoveEntityRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.RemoveEntityResponse.SerializeToString,
+            ),
+            'RemoveEntitiesWhere': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveEntitiesWhere,
+                    request_deserializer=src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereRequest.FromString,
+                    response_serializer=src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'queue.Queue', rpc_method_handlers)
@@ -112,6 +208,87 @@ class Queue(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamQueue(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/queue.Queue/StreamQueue',
+            src_dot_gen_dot_queue__service__pb2.StreamQueueRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.StreamQueueResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetPosition(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/queue.Queue/GetPosition',
+            src_dot_gen_dot_queue__service__pb2.GetPositionRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.GetPositionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListQueuesForEntity(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/queue.Queue/ListQueuesForEntity',
+            src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.ListQueuesForEntityResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SetQueue(request,
             target,
@@ -138,3 +315,84 @@ class Queue(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def AddEntity(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/queue.Queue/AddEntity',
+            src_dot_gen_dot_queue__service__pb2.AddEntityRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.AddEntityResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveEntity(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/queue.Queue/RemoveEntity',
+            src_dot_gen_dot_queue__service__pb2.RemoveEntityRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.RemoveEntityResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveEntitiesWhere(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/queue.Queue/RemoveEntitiesWhere',
+            src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereRequest.SerializeToString,
+            src_dot_gen_dot_queue__service__pb2.RemoveEntitiesWhereResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
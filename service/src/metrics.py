@@ -0,0 +1,111 @@
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Buckets cover fast cached tool calls through to slow model turns
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REQUEST_LATENCY = Histogram(
+    "service_http_request_duration_seconds",
+    "Time taken to serve an API request, including streaming its response",
+    ["method", "handler", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TOOL_LATENCY = Histogram(
+    "service_tool_call_duration_seconds",
+    "Time taken by a tool activity",
+    ["tool", "provider"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TOOL_ERRORS = Counter(
+    "service_tool_call_errors_total",
+    "Tool activities which failed or returned an error to the agent",
+    ["tool", "provider"],
+)
+
+MODEL_LATENCY = Histogram(
+    "service_model_call_duration_seconds",
+    "Time taken by a model call",
+    ["model", "streamed"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MODEL_TOKENS = Counter(
+    "service_model_tokens_total",
+    "Tokens used by model calls",
+    ["model", "type"],
+)
+
+
+@contextmanager
+def observe_tool(tool: str, provider: str) -> Iterator[None]:
+    """
+    observe_tool records the latency of the tool call made within it, and an error if
+    it raises. Errors returned to the agent must be recorded with `TOOL_ERRORS`.
+    """
+    start = perf_counter()
+    try:
+        yield
+    except BaseException:
+        TOOL_ERRORS.labels(tool, provider).inc()
+        raise
+    finally:
+        TOOL_LATENCY.labels(tool, provider).observe(perf_counter() - start)
+
+
+def registry() -> CollectorRegistry:
+    """
+    registry returns the registry to expose. Where PROMETHEUS_MULTIPROC_DIR is set, as it
+    must be when the API is served by several processes, the metrics of every process
+    are collected from that directory.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    collector = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector)
+    return collector
+
+
+async def serve_metrics(request: Request) -> Response:
+    return Response(generate_latest(registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    MetricsMiddleware records the latency of each request, labelled by the name of the
+    endpoint which handled it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router adds the endpoint to the scope once a route has matched
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], handler, str(status)).observe(perf_counter() - start)
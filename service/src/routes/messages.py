@@ -1,16 +1,17 @@
-from typing import List
+from asyncio import FIRST_COMPLETED, create_task, wait
+from typing import AsyncIterator, List, Optional
 from uuid import uuid4
 from http import HTTPStatus
 
 from fastapi import APIRouter, HTTPException
-from agents import TResponseInputItem
-from temporalio.client import WorkflowExecutionStatus, WorkflowHandle
-from temporalio.service import RPCError
-from temporalio.common import  WorkflowIDReusePolicy
+from fastapi.responses import StreamingResponse
+from temporalio.client import WithStartWorkflowOperation, WorkflowQueryRejectedError, WorkflowUpdateFailedError
+from temporalio.exceptions import ApplicationError
+from temporalio.service import RPCError, RPCStatusCode
+from temporalio.common import QueryRejectCondition, WorkflowIDConflictPolicy
 from loguru import logger
-from pydantic import BaseModel
 
-from src.schema import Message, ConversationResultSchema
+from src.schema import Message, MessageResponse, ConversationResultSchema, StreamEvent
 from src.config import cfg
 from src.workflows.conversation import Conversation, ConversationArgs
 from src import context
@@ -19,12 +20,14 @@ ALLOWED_QUEUES = ["default", "foo", "bar"]
 
 router = APIRouter(prefix="/messages")
 
-class MessageResponse(BaseModel):
-    text: str
-    actor: str
-
 @router.get("/{id}", response_model=List[MessageResponse])
-async def get_messages(id: str) -> List[MessageResponse]:
+async def get_messages(id: str, after: int = 0, epoch: Optional[str] = None) -> List[MessageResponse]:
+    """
+    Get the user's messages with a sequence number greater than `after`, so that clients
+    polling for new messages only receive those they have not seen. `epoch` is that of
+    the message `after` was read from. If the conversation has been restarted since, so
+    its messages have a different epoch, every message is returned.
+    """
     if id != context.get_auth_email():
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN,
@@ -32,53 +35,27 @@ async def get_messages(id: str) -> List[MessageResponse]:
         )
 
     client = await cfg.temporal_client
-    running = False
+    handle = client.get_workflow_handle(Conversation.id(id))
     try:
-        handle = client.get_workflow_handle(Conversation.id(id))
-        desc = await handle.describe()
-        running = desc.status == WorkflowExecutionStatus.RUNNING
+        # Rejected by the server if the conversation is not running, saving a describe call
+        return await handle.query(
+            Conversation.get_messages,
+            args=[after, epoch],
+            reject_condition=QueryRejectCondition.NOT_OPEN
+        )
+    except WorkflowQueryRejectedError:
+        return []
     except RPCError as e:
-        logger.error(f"error describing workflow: {e}")
-    except Exception as e:
-        logger.error(f"unexpected error describing workflow: {e}")
+        if e.status == RPCStatusCode.NOT_FOUND:
+            return []
+        logger.error(f"error querying workflow: {e}")
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="an unexpected error occurred") from e
 
-    if not running:
-        return []
-
-    history: List[TResponseInputItem] = await handle.query("get_history")
-
-    output: List[MessageResponse] = []
-    for message in history:
-        content = message.get("content")
-        if not content:
-            continue
-
-        actor = message.get("role")
-        if not actor:
-            continue
-
-        match(actor):
-            case "user":
-                output.append(MessageResponse(
-                    text=content.strip(),
-                    actor=actor
-                ))
-            case "assistant":
-                for c in content:
-                    if not (c.get("text") and c.get("type")):
-                        continue
-
-                    if c.get("type") == "output_text":
-                        output.append(MessageResponse(
-                            text=c.get("text").strip(),
-                            actor=actor
-                        ))
-
-    return output
-
-@router.post("/{id}", response_model=ConversationResultSchema)
-async def create_message(id: str, message: Message) -> ConversationResultSchema:
+def prepare_message(id: str, message: Message):
+    """
+    prepare_message checks that the user may send the message and attaches their auth
+    details to it.
+    """
     if id != context.get_auth_email():
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN,
@@ -95,34 +72,87 @@ async def create_message(id: str, message: Message) -> ConversationResultSchema:
             status_code=HTTPStatus.BAD_REQUEST,
             detail=f"Invalid queue '{message.queue}'. Must be one of: {', '.join(ALLOWED_QUEUES)}"
         )
-    
+
+async def send_message(id: str, message: Message) -> ConversationResultSchema:
+    """
+    send_message sends the message to the user's conversation and waits for the response.
+    The conversation is started if it is not running, in the same request to Temporal.
+    """
     client = await cfg.temporal_client
 
-    handle: WorkflowHandle[Conversation, str] | None = None
-    running = False
     try:
-        handle = client.get_workflow_handle(Conversation.id(id))
-        desc = await handle.describe()
-        running = desc.status == WorkflowExecutionStatus.RUNNING
-    except RPCError as e:
-        logger.error(f"error describing workflow: {e}")
-    except Exception as e:
-        logger.error(f"unexpected error describing workflow: {e}")
-        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="an unexpected error occurred") from e
-
-    if not running:
-        handle = await client.start_workflow(
-            Conversation.run,
-            ConversationArgs(user_id=id),
-            id=Conversation.id(id),
-            task_queue=cfg.temporal.task_queue,
-            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
+        return await client.execute_update_with_start_workflow(
+            Conversation.message,
+            message,
+            start_workflow_operation=WithStartWorkflowOperation(
+                Conversation.run,
+                ConversationArgs(
+                    user_id=id,
+                    max_pending=cfg.conversation.max_pending,
+                    coalesce_seconds=cfg.conversation.coalesce_seconds,
+                ),
+                id=Conversation.id(id),
+                task_queue=cfg.temporal.task_queue,
+                id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+            ),
+            id=str(uuid4())
         )
+    except WorkflowUpdateFailedError as e:
+        if isinstance(e.cause, ApplicationError) and e.cause.type == "TooManyMessages":
+            raise HTTPException(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                detail="too many messages are waiting to be answered"
+            ) from e
+        raise
 
-    result: ConversationResultSchema = await handle.execute_update(
-        "message",
-        message,
-        id=str(uuid4())
-    )
-
-    return result
\ No newline at end of file
+@router.post("/{id}", response_model=ConversationResultSchema)
+async def create_message(id: str, message: Message) -> ConversationResultSchema:
+    prepare_message(id, message)
+    return await send_message(id, message)
+
+def sse(event: StreamEvent) -> str:
+    return f"event: {event.type}\ndata: {event.model_dump_json(exclude_none=True)}\n\n"
+
+@router.post("/{id}/stream")
+async def stream_message(id: str, message: Message) -> StreamingResponse:
+    """
+    Streaming variant of `create_message` which responds with server-sent events as the
+    response is generated. `delta` events carry the response text as it is produced and
+    `tool_call` events name the tools the assistant calls. The stream ends with a `done`
+    event holding the complete response, or an `error` event.
+
+    Progress is only available when the worker runs in the same process as the API, or
+    `STREAMS_REDIS_URL` is set, otherwise the stream consists of the final event alone.
+    """
+    prepare_message(id, message)
+
+    async def events() -> AsyncIterator[str]:
+        # Subscribed before sending the message so no progress is missed
+        async with cfg.streams.broker.subscribe(Conversation.id(id)) as queue:
+            update = create_task(send_message(id, message))
+
+            try:
+                while not update.done():
+                    next_event = create_task(queue.get())
+                    await wait((next_event, update), return_when=FIRST_COMPLETED)
+                    if not next_event.done():
+                        next_event.cancel()
+                        break
+                    yield sse(next_event.result())
+
+                while not queue.empty():
+                    yield sse(queue.get_nowait())
+
+                try:
+                    result = update.result()
+                except Exception as e:
+                    logger.error(f"failed to process message: {e}")
+                    yield sse(StreamEvent(type="error", text="failed to process message"))
+                    return
+
+                yield sse(StreamEvent(type="done", text=result.message))
+            finally:
+                # The client has gone away, the message is still processed
+                update.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,9 +1,12 @@
-from typing import Optional, Dict, List
+from asyncio import Semaphore, Task, as_completed, create_task, gather
+from typing import AsyncIterator, Awaitable, Callable, Optional, Dict, List, Tuple, TypeVar
 from http import HTTPStatus
+import json
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from grpc import insecure_channel, RpcError
+from grpc import RpcError
 from temporalio.client import WorkflowExecutionStatus
 from temporalio.service import RPCError
 from loguru import logger
@@ -11,12 +14,20 @@ from loguru import logger
 from src import context
 from src.config import cfg
 from src.workflows.conversation import Conversation
-from src.routes.messages import ALLOWED_QUEUES
-from src.gen.queue_service_pb2 import GetQueueRequest, SetQueueRequest, GetQueueResponse
-from src.gen.queue_service_pb2_grpc import QueueStub
+from src.gen.queue_service_pb2 import (
+    GetPositionRequest,
+    GetPositionResponse,
+    ListQueuesForEntityRequest,
+    ListQueuesForEntityResponse,
+    RemoveEntitiesWhereRequest,
+    RemoveEntitiesWhereResponse,
+    EntityFilter,
+)
 
 router = APIRouter(prefix="/user")
 
+T = TypeVar("T")
+
 
 class UserResponse(BaseModel):
     """User information extracted from authentication headers."""
@@ -54,68 +65,118 @@ class UserDataResponse(BaseModel):
     conversation_history: Optional[List[Dict]] = None
 
 
-@router.get("/me/download", response_model=UserDataResponse)
-async def download_user_data() -> UserDataResponse:
+def discard(tasks: List[Task]):
     """
-    GDPR data export endpoint - returns all user data across all queues.
-    
-    This includes:
-    - All entities where the user's email is the entity ID
-    - Temporal workflow status
-    - Conversation history (messages and responses)
+    discard cancels any of the tasks which are still running, and retrieves the errors
+    of those which are not so that they are not reported as unhandled.
     """
-    email = context.get_auth_email()
-    if not email:
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="user email is required"
+    for task in tasks:
+        task.cancel()
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+
+def bounded(fn: Callable[[str], Awaitable[T]]) -> Callable[[str], Awaitable[T]]:
+    """
+    bounded wraps `fn` so that at most `cfg.backend.concurrency` calls are in flight.
+    """
+    semaphore = Semaphore(cfg.backend.concurrency)
+
+    async def call(queue_id: str) -> T:
+        async with semaphore:
+            return await fn(queue_id)
+
+    return call
+
+
+async def get_user_queue_ids(email: str) -> List[str]:
+    """
+    get_user_queue_ids returns the IDs of the queues the user has an entity in.
+    """
+    try:
+        response: ListQueuesForEntityResponse = await cfg.backend.stub.ListQueuesForEntity(
+            ListQueuesForEntityRequest(entity_id=email),
+            metadata=(
+                ("x-auth-request-email", email),
+            ),
+            timeout=cfg.backend.timeout
         )
+    except RpcError as e:
+        logger.error(f"failed to list queues for user: {e}")
+        raise
+
+    return list(response.queue_ids)
+
+
+async def get_user_queues(email: str) -> List[QueueData]:
+    """
+    get_user_queues returns the user's entities in every queue they are in.
+    """
+    queue_ids = await get_user_queue_ids(email)
+    get_queue_data = bounded(lambda queue_id: get_user_queue_data(queue_id, email))
+    fetches = [create_task(get_queue_data(queue_id)) for queue_id in queue_ids]
+    try:
+        queues = await gather(*fetches)
+    finally:
+        # A failed fetch fails the export, so the others are no longer needed
+        discard(fetches)
+    return [queue for queue in queues if queue is not None]
+
+
+async def get_user_queue_data(queue_id: str, email: str) -> Optional[QueueData]:
+    """
+    get_user_queue_data returns the user's entity in the given queue, if they have one.
+    """
+    try:
+        response: GetPositionResponse = await cfg.backend.stub.GetPosition(
+            GetPositionRequest(id=queue_id, entity_id=email),
+            metadata=(
+                ("x-auth-request-email", email),
+            ),
+            timeout=cfg.backend.timeout
+        )
+    except RpcError as e:
+        logger.error(f"failed to get queue {queue_id}: {e}")
+        raise
     
-    logger.info(f"GDPR export requested for user: {email}")
-    
-    queues_data: List[QueueData] = []
+    if not response.HasField("entity"):
+        return None
     
-    # Query all known queues for user's entities
+    return QueueData(
+        queue_id=queue_id,
+        entities=[{"id": response.entity.id, "name": response.entity.name}]
+    )
+
+
+async def remove_user_entities(queue_id: str, email: str) -> bool:
+    """
+    remove_user_entities removes the user's entities from the given queue and reports
+    whether there were any.
+    """
     try:
-        with insecure_channel(cfg.backend.url) as channel:
-            stub = QueueStub(channel)
-            
-            for queue_id in ALLOWED_QUEUES:
-                try:
-                    response = stub.GetQueue(
-                        GetQueueRequest(id=queue_id),
-                        metadata=(
-                            ("x-auth-request-email", email),
-                        )
-                    )
-                    
-                    # Filter entities that belong to this user (entity.id == user email)
-                    user_entities = [
-                        {"id": entity.id, "name": entity.name}
-                        for entity in response.entities
-                        if entity.id == email
-                    ]
-                    
-                    if user_entities:
-                        queues_data.append(QueueData(
-                            queue_id=queue_id,
-                            entities=user_entities
-                        ))
-                except RpcError as e:
-                    logger.error(f"failed to get queue {queue_id}: {e}")
-                    raise HTTPException(
-                        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-                        detail=f"failed to retrieve queue {queue_id}"
-                    )
-                    
-    except Exception as e:
-        logger.error(f"failed to query backend: {e}")
-        raise HTTPException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-            detail="failed to retrieve queue data"
+        response: RemoveEntitiesWhereResponse = await cfg.backend.stub.RemoveEntitiesWhere(
+            RemoveEntitiesWhereRequest(
+                id=queue_id,
+                filter=EntityFilter(entity_id=email)
+            ),
+            metadata=(
+                ("x-auth-request-email", email),
+            ),
+            timeout=cfg.backend.timeout
         )
-    
-    # Get workflow status
+    except RpcError as e:
+        logger.error(f"failed to process queue {queue_id}: {e}")
+        raise
+
+    if response.removed:
+        logger.info(f"removed user entity from queue: {queue_id}")
+    return response.removed > 0
+
+
+async def get_conversation(email: str) -> Tuple[str, Optional[List[Dict]]]:
+    """
+    get_conversation returns the status of the user's conversation workflow and, if it
+    is running, its history.
+    """
     workflow_status = None
     conversation_history = None
     try:
@@ -136,14 +197,104 @@ async def download_user_data() -> UserDataResponse:
         logger.warning(f"failed to get workflow status: {e}")
         workflow_status = "UNKNOWN"
     
+    return workflow_status, conversation_history
+
+
+@router.get("/me/download", response_model=UserDataResponse)
+async def download_user_data() -> UserDataResponse:
+    """
+    GDPR data export endpoint - returns all user data across all queues.
+
+    This includes:
+    - All entities where the user's email is the entity ID
+    - Temporal workflow status
+    - Conversation history (messages and responses)
+    """
+    email = context.get_auth_email()
+    if not email:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="user email is required"
+        )
+
+    logger.info(f"GDPR export requested for user: {email}")
+
+    # Queues and the conversation are independent so are fetched concurrently
+    fetches = [create_task(get_user_queues(email)), create_task(get_conversation(email))]
+    try:
+        queues, (workflow_status, conversation_history) = await gather(*fetches)
+    except RpcError:
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            detail="failed to retrieve queue data"
+        )
+    finally:
+        discard(fetches)
+
     logger.info(f"GDPR export completed for user: {email}")
     return UserDataResponse(
-        queues=queues_data,
+        queues=queues,
         workflow_status=workflow_status,
         conversation_history=conversation_history
     )
 
 
+@router.get("/me/download/stream")
+async def stream_user_data() -> StreamingResponse:
+    """
+    Streaming variant of the GDPR data export, for users with large amounts of data.
+
+    The response is newline-delimited JSON. Each queue containing user data is written
+    as a `{"queue": ...}` line as soon as it has been retrieved, followed by a
+    `{"workflow_status": ...}` line and one `{"message": ...}` line per conversation item.
+    """
+    email = context.get_auth_email()
+    if not email:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="user email is required"
+        )
+
+    logger.info(f"GDPR streaming export requested for user: {email}")
+
+    get_queue_data = bounded(lambda queue_id: get_user_queue_data(queue_id, email))
+
+    async def lines() -> AsyncIterator[str]:
+        conversation = create_task(get_conversation(email))
+        fetches: List[Task[Optional[QueueData]]] = []
+
+        try:
+            try:
+                queue_ids = await get_user_queue_ids(email)
+            except RpcError:
+                queue_ids = []
+                yield json.dumps({"error": "failed to retrieve queue data"}) + "\n"
+
+            fetches = [create_task(get_queue_data(queue_id)) for queue_id in queue_ids]
+            for queue in as_completed(fetches):
+                # Headers have already been sent, so failures can only be reported in-band
+                try:
+                    data = await queue
+                except RpcError:
+                    yield json.dumps({"error": "failed to retrieve queue data"}) + "\n"
+                    continue
+
+                if data is not None:
+                    yield json.dumps({"queue": data.model_dump()}) + "\n"
+
+            workflow_status, conversation_history = await conversation
+            yield json.dumps({"workflow_status": workflow_status}) + "\n"
+            for message in conversation_history or []:
+                yield json.dumps({"message": message}) + "\n"
+
+            logger.info(f"GDPR streaming export completed for user: {email}")
+        finally:
+            # The client may have gone away, leaving work that is no longer needed
+            discard([conversation, *fetches])
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 class DeleteUserDataResponse(BaseModel):
     """GDPR deletion response."""
     success: bool
@@ -189,54 +340,17 @@ async def delete_user_data() -> DeleteUserDataResponse:
         )
     
     # Delete user entities from all queues
-    deleted_from_queues: List[str] = []
+    remove = bounded(lambda queue_id: remove_user_entities(queue_id, email))
     try:
-        with insecure_channel(cfg.backend.url) as channel:
-            stub = QueueStub(channel)
-            
-            for queue_id in ALLOWED_QUEUES:
-                try:
-                    # Get current queue
-                    response: GetQueueResponse = stub.GetQueue(
-                        GetQueueRequest(id=queue_id),
-                        metadata=(
-                            ("x-auth-request-email", email),
-                        )
-                    )
-
-                    # Filter out user's entities
-                    remaining_entities = [
-                        entity for entity in response.entities
-                        if entity.id.replace(" ", "") != email.replace(" ", "")
-                    ]
-                    
-                    # Update queue if any entities were removed
-                    if len(remaining_entities) < len(response.entities):
-                        stub.SetQueue(
-                            SetQueueRequest(
-                                id=queue_id,
-                                entities=remaining_entities
-                            ),
-                            metadata=(
-                                ("x-auth-request-email", email),
-                            )
-                        )
-                        deleted_from_queues.append(queue_id)
-                        logger.info(f"removed user entity from queue: {queue_id}")
-                        
-                except RpcError as e:
-                    logger.error(f"failed to process queue {queue_id}: {e}")
-                    raise HTTPException(
-                        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-                        detail=f"failed to delete from queue {queue_id}"
-                    )
-                    
-    except Exception as e:
-        logger.error(f"unexpected error deleting user data: {e}")
+        queue_ids = await get_user_queue_ids(email)
+        removed = await gather(*(remove(queue_id) for queue_id in queue_ids))
+    except RpcError:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail="failed to delete user data"
         )
+
+    deleted_from_queues = [queue_id for queue_id, deleted in zip(queue_ids, removed) if deleted]
     
     message = "User data deleted successfully"
     if workflow_terminated:
@@ -1 +1,2 @@
-from .conversation import *
\ No newline at end of file
+from .conversation import *
+from .tools import *
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -21,4 +21,27 @@ class Message(BaseModel):
     auth_name: Optional[str] = None
     auth_user: Optional[str] = None
     auth_email: Optional[str] = None
-    auth_groups: Optional[str] = None
\ No newline at end of file
+    auth_groups: Optional[str] = None
+
+
+class MessageResponse(BaseModel):
+    """
+    MessageResponse is a message in a conversation as shown to the user. Messages are
+    numbered in order by `seq`, starting at 1. `epoch` identifies the conversation the
+    message belongs to, as numbering starts again when a conversation is restarted.
+    """
+    seq: int = 0
+    epoch: str = ""
+    text: str
+    actor: str
+
+class StreamEvent(BaseModel):
+    """
+    StreamEvent is an update on the progress of a response that is being generated.
+    `delta` events carry the next piece of the response's text, `tool_call` events name
+    a tool the assistant is calling, `done` carries the complete response and `error`
+    reports that no response could be generated.
+    """
+    type: Literal["delta", "tool_call", "done", "error"]
+    text: Optional[str] = None
+    name: Optional[str] = None
@@ -0,0 +1,63 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+# These mirror the results of the MCP server's tools. Descriptions are omitted as the
+# tool output schemas already carry them.
+
+class QueueEntity(BaseModel):
+    """
+    QueueEntity is an entity in a queue.
+    """
+    id: str
+    name: str
+
+class QueuePage(BaseModel):
+    """
+    QueuePage is a run of consecutive entities from a queue.
+    """
+    entities: List[QueueEntity]
+    offset: int
+    total: int
+    next_offset: Optional[int] = None
+
+class QueuePosition(BaseModel):
+    """
+    QueuePosition describes where an entity is in a queue.
+    """
+    entity_id: str
+    found: bool
+    name: Optional[str] = None
+    position: Optional[int] = None
+    length: int
+
+class EntityAdded(BaseModel):
+    """
+    EntityAdded describes an entity that has been added to a queue.
+    """
+    entity_id: str
+    name: str
+    position: int
+
+class EntityRemoved(BaseModel):
+    """
+    EntityRemoved describes the outcome of removing an entity from a queue.
+    """
+    entity_id: str
+    removed: bool
+
+# Models that the structured results of known tools are deserialised into
+tool_results: dict[str, type[BaseModel]] = {
+    "get_queue": QueuePage,
+    "get_position": QueuePosition,
+    "add_to_queue": EntityAdded,
+    "remove_from_queue": EntityRemoved,
+}
+
+class ToolCatalog(BaseModel):
+    """
+    ToolCatalog is a version of the set of tools available to the agent. The tools are the
+    MCP tool definitions, and are empty where the tools are defined statically.
+    """
+    version: str
+    tools: List[dict[str, Any]] = []
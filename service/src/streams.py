@@ -0,0 +1,132 @@
+from asyncio import CancelledError, Queue, QueueFull, create_task
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .schema import StreamEvent
+
+# Prefix of the pub/sub channels events are relayed on, followed by the workflow ID
+CHANNEL_PREFIX = "queue:stream:"
+
+
+class StreamBroker:
+    """
+    StreamBroker relays the progress of responses from the activities generating them to
+    the requests waiting on them, keyed by conversation workflow ID. It is in-process, so
+    only requests served by the same process as the worker receive events.
+    """
+
+    def __init__(self, buffer: int = 1024):
+        self._buffer = buffer
+        self._subscribers: defaultdict[str, set[Queue[StreamEvent]]] = defaultdict(set)
+
+    async def has_subscribers(self, key: str) -> bool:
+        return bool(self._subscribers.get(key))
+
+    async def publish(self, key: str, event: StreamEvent):
+        """
+        publish sends the event to every subscriber of the key. Events are dropped for
+        subscribers that are not keeping up rather than holding up the response.
+        """
+        for queue in self._subscribers.get(key, ()):
+            _offer(queue, key, event)
+
+    @asynccontextmanager
+    async def subscribe(self, key: str) -> AsyncIterator[Queue[StreamEvent]]:
+        """
+        subscribe yields a queue which receives the events published for the key until
+        the context exits.
+        """
+        queue: Queue[StreamEvent] = Queue(maxsize=self._buffer)
+        self._subscribers[key].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[key].discard(queue)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+
+
+class RedisStreamBroker(StreamBroker):
+    """
+    RedisStreamBroker relays events through Redis pub/sub, so that requests receive the
+    progress of responses generated by workers in other processes. Events published
+    while nobody is subscribed are lost, as with the in-process broker, and should Redis
+    be unavailable responses are generated without streaming rather than failing.
+    """
+
+    def __init__(self, url: str, buffer: int = 1024):
+        super().__init__(buffer)
+        self._url = url
+        self._client: Redis | None = None
+
+    @property
+    def client(self) -> Redis:
+        """
+        client returns the Redis client, created on first use so that it is bound to the
+        event loop of the process using it.
+        """
+        if self._client is None:
+            self._client = Redis.from_url(self._url)
+        return self._client
+
+    async def has_subscribers(self, key: str) -> bool:
+        try:
+            [(_, count)] = await self.client.pubsub_numsub(CHANNEL_PREFIX + key)
+        except RedisError as e:
+            logger.warning(f"failed to check for stream subscribers: {e}")
+            return False
+        return count > 0
+
+    async def publish(self, key: str, event: StreamEvent):
+        try:
+            await self.client.publish(CHANNEL_PREFIX + key, event.model_dump_json())
+        except RedisError as e:
+            logger.debug(f"dropping stream event for {key}: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, key: str) -> AsyncIterator[Queue[StreamEvent]]:
+        queue: Queue[StreamEvent] = Queue(maxsize=self._buffer)
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribed before yielding so no progress is missed
+            await pubsub.subscribe(CHANNEL_PREFIX + key)
+        except RedisError as e:
+            logger.warning(f"failed to subscribe to stream events for {key}: {e}")
+            await pubsub.aclose()
+            yield queue
+            return
+
+        async def relay():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _offer(queue, key, StreamEvent.model_validate_json(message["data"]))
+
+        relaying = create_task(relay())
+        try:
+            yield queue
+        finally:
+            relaying.cancel()
+            try:
+                await relaying
+            except CancelledError:
+                pass
+            except Exception as e:
+                logger.warning(f"stream relay for {key} failed: {e}")
+
+            try:
+                await pubsub.unsubscribe()
+            except RedisError:
+                pass
+            await pubsub.aclose()
+
+
+def _offer(queue: Queue[StreamEvent], key: str, event: StreamEvent):
+    try:
+        queue.put_nowait(event)
+    except QueueFull:
+        logger.debug(f"dropping stream event for slow subscriber to {key}")
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from .config.config import TracingConfig
+
+tracer = trace.get_tracer("queue.service")
+
+
+def setup_tracing(config: "TracingConfig"):
+    """
+    setup_tracing installs a tracer provider exporting to the configured exporter. Where a
+    provider has already been installed, e.g. by OpenTelemetry auto-instrumentation, it
+    is left in place.
+    """
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        return
+
+    exporter = config.span_exporter
+    if exporter is None:
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": config.service_name}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def trace_context() -> dict[str, str]:
+    """
+    trace_context returns the current trace context as headers, for propagation to the
+    MCP server or backend.
+    """
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def trace_tool(tool: str, provider: str) -> Iterator[Span]:
+    """
+    trace_tool records a span for the tool call made within it. Errors returned to the
+    agent must be recorded with `mark_error`.
+    """
+    with tracer.start_as_current_span(
+        f"tool {tool}",
+        kind=SpanKind.CLIENT,
+        attributes={"tool.name": tool, "tool.provider": provider},
+    ) as span:
+        yield span
+
+
+def mark_error(description: str):
+    """
+    mark_error marks the current span as failed without an exception having been raised.
+    """
+    trace.get_current_span().set_status(Status(StatusCode.ERROR, description))
+
+
+class TracingMiddleware:
+    """
+    TracingMiddleware records a span for each request, continuing any trace propagated
+    in the request's headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode('latin-1'): value.decode('latin-1') for key, value in scope["headers"]}
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            async def send_with_status(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router adds the endpoint to the scope once a route has matched
+                if endpoint := scope.get("endpoint"):
+                    span.update_name(f"{scope['method']} {getattr(endpoint, '__name__', scope['path'])}")
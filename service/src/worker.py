@@ -1,3 +1,6 @@
+from asyncio import CancelledError, create_task, shield
+from datetime import timedelta
+
 from temporalio.worker import Worker
 from loguru import logger
 
@@ -6,8 +9,8 @@ from .workflows import Conversation
 
 async def run_worker():
     logger.info("starting Temporal worker...")
-    client = await cfg.temporal_client
-    await cfg.mcp.init_tools()
+    client = await cfg.worker_temporal_client()
+    await cfg.tool_provider.init_tools()
 
     worker = Worker(
         client,
@@ -16,8 +19,26 @@ async def run_worker():
             Conversation
         ],
         activities=[
-            *cfg.mcp.activities
+            *cfg.worker_activities
         ],
+        max_concurrent_workflow_tasks=cfg.worker.max_concurrent_workflow_tasks,
+        max_concurrent_activities=cfg.worker.max_concurrent_activities,
+        max_concurrent_local_activities=cfg.worker.max_concurrent_local_activities,
+        workflow_task_poller_behavior=cfg.worker.workflow_task_poller_behavior,
+        activity_task_poller_behavior=cfg.worker.activity_task_poller_behavior,
+        graceful_shutdown_timeout=timedelta(seconds=cfg.worker.graceful_shutdown_timeout),
     )
 
-    await worker.run()
\ No newline at end of file
+    # Tools are refreshed in the background so changes are rolled out without a restart
+    refresher = create_task(cfg.tool_provider.watch_tools(cfg.tools.refresh_interval))
+    running = create_task(worker.run())
+    try:
+        await shield(running)
+    except CancelledError:
+        # Cancelling the worker's run directly could also cancel its shutdown
+        logger.info("stopping Temporal worker...")
+        await worker.shutdown()
+        raise
+    finally:
+        refresher.cancel()
+        await cfg.mcp.sessions.close()
\ No newline at end of file
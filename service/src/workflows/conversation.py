@@ -1,9 +1,13 @@
-from asyncio import Lock
-from typing import List, Optional
+from asyncio import TimeoutError
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
 from datetime import timedelta
 import hashlib
 
 from temporalio import workflow
+from temporalio.exceptions import ApplicationError
 
 with workflow.unsafe.imports_passed_through():
     from pydantic import BaseModel
@@ -16,8 +20,9 @@ with workflow.unsafe.imports_passed_through():
     )
     from temporalio.contrib.openai_agents.workflow import activity_as_tool
 
-    from src.schema import Message, ConversationResultSchema
+    from src.schema import Message, MessageResponse, ConversationResultSchema
     from src.config import cfg
+    from src.workflows.history import compact, transcript, turns
 
 class AuthContext(BaseModel):
     """Context object passed to Runner with auth headers."""
@@ -26,10 +31,7 @@ class AuthContext(BaseModel):
     auth_groups: Optional[str] = None
     auth_name: Optional[str] = None
 
-agent = Agent(
-    name="Conversation Agent",
-    model=cfg.openai.model,
-    instructions="""
+INSTRUCTIONS = """
     You are a helpful assistant for a queue management system.
     You have access to tools that allow you to interact with queues, 
     such as adding entities to queues and retrieving the contents of 
@@ -43,30 +45,64 @@ agent = Agent(
 
     If no name is specified when adding an entity to a queue, the user name
     should be used as the entity name. If the name is empty, the user ID should be used.
-    """,
 
-    # The Temporal integration with OpenAI Agents does not currently support dynamic calls to MCP servers,
-    # thus this workaround is necessary. It caches the tools at startup.
-    # mcp_servers=[cfg.mcp.streamable_http],
-    tools=[activity_as_tool(tool, start_to_close_timeout=timedelta(seconds=10)) for tool in cfg.mcp.activities]
+    To find where an entity is in a queue, use get_position rather than
+    retrieving the whole queue.
+    """
 
-    # gpt-oss:20b doesn't work with structured outputs yet: https://github.com/ollama/ollama/issues/11691
-    # I would like to use it though so I'm going to go for no structured output for now
-    # output_type=ConversationResultSchema
-)
+def build_agent(tools: List[Callable]) -> Agent:
+    """
+    build_agent returns the conversation agent with the given tool activities.
+    """
+    return Agent(
+        name="Conversation Agent",
+        model=cfg.openai.model,
+        instructions=INSTRUCTIONS,
+
+        # The Temporal integration with OpenAI Agents does not currently support dynamic calls to MCP servers,
+        # thus this workaround is necessary. The tools are taken from the tool catalog instead.
+        # mcp_servers=[cfg.mcp.streamable_http],
+        tools=[activity_as_tool(tool, start_to_close_timeout=timedelta(seconds=10)) for tool in tools]
+
+        # gpt-oss:20b doesn't work with structured outputs yet: https://github.com/ollama/ollama/issues/11691
+        # I would like to use it though so I'm going to go for no structured output for now
+        # output_type=ConversationResultSchema
+    )
 
 class ConversationArgs(BaseModel):
     user_id: str
     history: Optional[List[TResponseInputItem]] = []
+    # Unset when continuing from a version of the workflow that did not carry messages
+    messages: Optional[List[MessageResponse]] = None
+    # Number of messages that may wait to be processed before further messages are rejected
+    max_pending: int = 10
+    # Seconds to wait for further messages to answer along with the first, 0 to only
+    # combine messages that arrived while the previous ones were processed
+    coalesce_seconds: float = 0
+
+@dataclass
+class _Pending:
+    ticket: int
+    message: Message
 
 @workflow.defn
 class Conversation:
     def __init__(self):
-        self._message: Message | None = None
         self._response: RunResult | None = None
+        self._agent: Agent | None = None
+        self._tools_version: Optional[str] = None
         self._history: List[TResponseInputItem] = []
-        self._processing: Lock = Lock()
+        # Messages waiting to be processed, in the order they arrived, and the results
+        # of processed messages until their update handlers have returned them
+        self._pending: Deque[_Pending] = deque()
+        self._results: Dict[int, ConversationResultSchema] = {}
+        self._next_ticket: int = 0
+        self._max_pending: int = 10
+        self._coalesce_seconds: float = 0
         self._message_limit: int = 50
+        # Messages shown to the user, which outlive the compacted history
+        self._messages: List[MessageResponse] = []
+        self._transcript_limit: int = 200
         self._user: str = ""
         # Store auth headers to pass to activities
         self._auth_name: Optional[str] = None
@@ -84,32 +120,115 @@ class Conversation:
     async def get_history(self) -> List[TResponseInputItem]:
         return self._history
 
+    @workflow.query
+    async def get_messages(self, after: int = 0, epoch: Optional[str] = None) -> List[MessageResponse]:
+        """
+        get_messages returns the messages with a sequence number greater than `after`. If
+        `epoch` is not the conversation's, or `after` is beyond the last message, the
+        cursor must belong to an earlier conversation so every message is returned.
+        """
+        # The first run's ID is kept across continue-as-new but not by a new conversation
+        current = workflow.info().first_execution_run_id
+        messages = self._messages
+        if messages and (epoch is None or epoch == current) and after <= messages[-1].seq:
+            messages = messages[bisect_right(messages, after, key=lambda m: m.seq):]
+        return [message.model_copy(update={"epoch": current}) for message in messages]
+
+    def _record(self, items: List[TResponseInputItem]):
+        seq = self._messages[-1].seq if self._messages else 0
+        for actor, text in transcript(items):
+            seq += 1
+            self._messages.append(MessageResponse(seq=seq, text=text, actor=actor))
+        self._messages = self._messages[-self._transcript_limit:]
+
     @workflow.update
     async def message(self, message: Message) -> ConversationResultSchema:
-        async with self._processing:
-            if self._message is not None:
-                raise RuntimeError("message already set, cannot update.")
-
-            self._auth_name = message.auth_name
-            self._auth_user = message.auth_user
-            self._auth_email = message.auth_email
-            self._auth_groups = message.auth_groups
-
-            self._message = message
-            await workflow.wait_condition(lambda: self._message is None)
-            return ConversationResultSchema(
-                message=self._response.final_output_as(str)
+        """
+        message queues the message and returns the response once it has been processed.
+        Messages that queue up while others are processed are answered together.
+        """
+        self._auth_name = message.auth_name
+        self._auth_user = message.auth_user
+        self._auth_email = message.auth_email
+        self._auth_groups = message.auth_groups
+
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._pending.append(_Pending(ticket=ticket, message=message))
+
+        await workflow.wait_condition(lambda: ticket in self._results)
+        return self._results.pop(ticket)
+
+    @message.validator
+    def validate_message(self, message: Message):
+        # Rejected updates are not recorded in the workflow's history
+        if len(self._pending) >= self._max_pending:
+            raise ApplicationError(
+                "too many messages waiting to be processed",
+                type="TooManyMessages",
+                non_retryable=True,
             )
 
+    def _next_batch(self) -> List[_Pending]:
+        """
+        _next_batch takes the oldest pending message along with those following it which
+        are about the same queue.
+        """
+        batch = [self._pending.popleft()]
+        while self._pending and self._pending[0].message.queue == batch[0].message.queue:
+            batch.append(self._pending.popleft())
+        return batch
+
+    async def _current_agent(self) -> Agent:
+        """
+        _current_agent returns the agent with the tools of the current tool catalog. The
+        catalog is fetched by a local activity so that its version is recorded in the
+        history and a replayed turn sees the tools it was originally run with.
+        """
+        if not workflow.patched("versioned-tools"):
+            # Conversations started before tools were versioned use the worker's tools
+            if self._agent is None:
+                self._agent = build_agent(cfg.tool_provider.activities)
+            return self._agent
+
+        catalog = await workflow.execute_local_activity(
+            cfg.catalog_activity,
+            start_to_close_timeout=timedelta(seconds=5),
+        )
+        if self._agent is None or catalog.version != self._tools_version:
+            self._agent = build_agent(cfg.tool_provider.activities_for(catalog))
+            self._tools_version = catalog.version
+        return self._agent
+
     @workflow.run
     async def run(self, args: ConversationArgs) -> str:
         workflow.logger.info(f"starting conversation for user {args.user_id}")
         self._user = args.user_id
         self._history = args.history or []
+        self._max_pending = args.max_pending
+        self._coalesce_seconds = args.coalesce_seconds
+        if args.messages is not None:
+            self._messages = args.messages
+        else:
+            self._record(self._history)
 
         while True:
-            await workflow.wait_condition(lambda: self._message is not None)
-            workflow.logger.info(f"processing message: {self._message.text}")
+            await workflow.wait_condition(lambda: len(self._pending) > 0)
+
+            if self._coalesce_seconds > 0:
+                # Give rapid-fire messages a chance to arrive so they share a model turn
+                try:
+                    await workflow.wait_condition(
+                        lambda: len(self._pending) >= self._max_pending,
+                        timeout=timedelta(seconds=self._coalesce_seconds),
+                    )
+                except TimeoutError:
+                    pass
+
+            batch = self._next_batch()
+            queue = batch[0].message.queue
+            text = "\n\n".join(pending.message.text for pending in batch)
+            workflow.logger.info(f"processing {len(batch)} message(s): {text}")
 
             auth_context = AuthContext(
                 auth_name=self._auth_name,
@@ -119,7 +238,7 @@ class Conversation:
             )
 
             self._response = await Runner.run(
-                agent,
+                await self._current_agent(),
                 self._history + [
                     {
                         "role": "developer",
@@ -128,13 +247,13 @@ class Conversation:
                             User ID: {auth_context.auth_user}
                             User email: {auth_context.auth_email}
                             User groups: {auth_context.auth_groups}
-                            Queue: {self._message.queue}
+                            Queue: {queue}
                         """
                     },
                     {
                         "role": "user",
                         "content": f"""
-                            {self._message.text}
+                            {text}
                         """
                     }
                 ],
@@ -144,12 +263,30 @@ class Conversation:
                 )
             )
 
-            self._history = [msg for msg in self._response.to_input_list() if msg.get("role") != "developer"][-self._message_limit:]
-            self._message = None
+            history = [msg for msg in self._response.to_input_list() if msg.get("role") != "developer"]
+            self._record(turns(history)[-1])
+            self._history = compact(
+                history,
+                max_tokens=cfg.openai.history_budget,
+                max_items=self._message_limit,
+            )
+
+            result = ConversationResultSchema(message=self._response.final_output_as(str))
+            for pending in batch:
+                self._results[pending.ticket] = result
 
             if workflow.info().is_continue_as_new_suggested():
+                # Handlers must return their results first, and pending messages would be
+                # lost so continuing is put off while there are any
+                await workflow.wait_condition(lambda: workflow.all_handlers_finished() or len(self._pending) > 0)
+                if self._pending:
+                    continue
+
                 workflow.logger.info("continuing as new to avoid history growth")
                 workflow.continue_as_new(ConversationArgs(
                     user_id=self._user,
                     history=self._history,
+                    messages=self._messages,
+                    max_pending=self._max_pending,
+                    coalesce_seconds=self._coalesce_seconds,
                 ))
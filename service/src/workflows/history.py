@@ -0,0 +1,95 @@
+import json
+from typing import List, Tuple
+
+from agents import TResponseInputItem
+
+# Tokenizers differ between models, so tokens are estimated from the serialised length
+# of an item. This is deterministic, which matters as it runs inside the workflow.
+CHARS_PER_TOKEN = 4
+
+MESSAGE_ROLES = ("user", "assistant", "system", "developer")
+
+
+def estimate_tokens(item: TResponseInputItem) -> int:
+    """
+    estimate_tokens returns the approximate number of tokens an item adds to a prompt.
+    """
+    return len(json.dumps(item, default=str)) // CHARS_PER_TOKEN + 1
+
+
+def is_message(item: TResponseInputItem) -> bool:
+    """
+    is_message reports whether an item is a message, as opposed to a tool call, tool
+    result or other intermediate item.
+    """
+    return item.get("role") in MESSAGE_ROLES and item.get("type", "message") == "message"
+
+
+def turns(history: List[TResponseInputItem]) -> List[List[TResponseInputItem]]:
+    """
+    turns splits the history into turns, each starting with a user message.
+    """
+    result: List[List[TResponseInputItem]] = []
+    for item in history:
+        if not result or (is_message(item) and item.get("role") == "user"):
+            result.append([])
+        result[-1].append(item)
+    return result
+
+
+def compact(history: List[TResponseInputItem], max_tokens: int, max_items: int) -> List[TResponseInputItem]:
+    """
+    compact trims the history to at most `max_tokens` estimated tokens and `max_items`
+    items. Tool calls and their results are dropped from the oldest turns first, as they
+    are rarely needed once the assistant has answered, followed by the oldest turns as a
+    whole. The latest turn is always kept intact.
+    """
+    history_turns = turns(history)
+    tokens = sum(estimate_tokens(item) for item in history)
+    items = len(history)
+
+    # A turn's tool items are dropped together so no call is left without its result
+    for turn in history_turns[:-1]:
+        if tokens <= max_tokens:
+            break
+
+        dropped = [item for item in turn if not is_message(item)]
+        tokens -= sum(estimate_tokens(item) for item in dropped)
+        items -= len(dropped)
+        turn[:] = [item for item in turn if is_message(item)]
+
+    while len(history_turns) > 1 and (tokens > max_tokens or items > max_items):
+        dropped = history_turns.pop(0)
+        tokens -= sum(estimate_tokens(item) for item in dropped)
+        items -= len(dropped)
+
+    return [item for turn in history_turns for item in turn]
+
+
+def transcript(items: List[TResponseInputItem]) -> List[Tuple[str, str]]:
+    """
+    transcript returns the (actor, text) pairs of the user and assistant messages among
+    the items, as shown to the user.
+    """
+    output: List[Tuple[str, str]] = []
+    for item in items:
+        content = item.get("content")
+        if not content:
+            continue
+
+        actor = item.get("role")
+        if not actor:
+            continue
+
+        match(actor):
+            case "user":
+                output.append((actor, content.strip()))
+            case "assistant":
+                for c in content:
+                    if not (c.get("text") and c.get("type")):
+                        continue
+
+                    if c.get("type") == "output_text":
+                        output.append((actor, c.get("text").strip()))
+
+    return output
@@ -3,14 +3,29 @@ import { type Message } from '@/features/chat/types'
 
 interface GetChatArgs {
     id: string
+    // Messages already retrieved, only newer messages are requested
+    previous?: Array<Message>
 }
 
-export const GetChat = async ({ id }: GetChatArgs): Promise<Array<Message>> => {
-    const response = await fetch(`${Config.apiURL}/service/messages/${id}`)
+export const GetChat = async ({ id, previous = [] }: GetChatArgs): Promise<Array<Message>> => {
+    const last = previous.at(-1)
+    const after = last?.seq ?? 0
+    const params = new URLSearchParams({ after: String(after) })
+    if (last?.epoch) {
+        params.set('epoch', last.epoch)
+    }
+
+    const response = await fetch(`${Config.apiURL}/service/messages/${id}?${params}`)
     if (response.status === 404) {
         return []
     }
-    return await response.json()
+
+    const messages: Array<Message> = await response.json()
+    // The service returns every message if the conversation has restarted since the cursor
+    if (messages.length > 0 && ((last?.epoch && messages[0].epoch !== last.epoch) || (messages[0].seq ?? 0) <= after)) {
+        return messages
+    }
+    return [...previous, ...messages]
 }
 
 interface SendMessageArgs {
@@ -1,15 +1,24 @@
+import { useRef } from 'react'
 import { toast } from 'sonner'
 import useSWR from 'swr'
 
 import { GetChat, SendMessage } from '@/features/chat/api'
-import type { Role } from '@/features/chat/types'
+import type { Message, Role } from '@/features/chat/types'
 
 interface useChatArgs {
     id: string
 }
 
 const useChat = ({ id }: useChatArgs) => {
-    const { data, mutate, ...rest } = useSWR(({ id }), GetChat)
+    // Messages confirmed by the service, so each fetch only requests newer ones
+    const fetched = useRef<{ id: string, messages: Array<Message> }>({ id, messages: [] })
+
+    const { data, mutate, ...rest } = useSWR(({ id }), async ({ id }: useChatArgs) => {
+        const previous = fetched.current.id === id ? fetched.current.messages : []
+        const messages = await GetChat({ id, previous })
+        fetched.current = { id, messages }
+        return messages
+    })
 
     const send = async (message: string, queue: string) => {
         const messages = [...(data || []), { actor: 'user' as Role, text: message }]
@@ -1,6 +1,10 @@
 export type Role = 'user' | 'assistant'
 
 export interface Message {
+    // Set by the service, starting at 1. Unset on messages it has not yet confirmed.
+    seq?: number
+    // Set by the service, changing when the conversation is restarted and numbering with it
+    epoch?: string
     text: string
     actor: Role
 }
\ No newline at end of file